@@ -5,8 +5,8 @@ a = Analysis(
     ['modern_gui_app.py'],
     pathex=[],
     binaries=[],
-    datas=[('C:\\Users\\Dhanajay.s\\AppData\\Roaming\\Python\\Python313\\site-packages\\customtkinter', 'customtkinter/'), ('D:\\Excel Byforgation\\live work\\live work\\reslivemain', 'reslivemain/'), ('D:\\Excel Byforgation\\live work\\live work\\resvaduvlive', 'resvaduvlive/')],
-    hiddenimports=['pandas', 'openpyxl', 'PIL', 'tqdm'],
+    datas=[('C:\\Users\\Dhanajay.s\\AppData\\Roaming\\Python\\Python313\\site-packages\\customtkinter', 'customtkinter/'), ('D:\\Excel Byforgation\\live work\\live work\\reslivemain', 'reslivemain/'), ('D:\\Excel Byforgation\\live work\\live work\\resvaduvlive', 'resvaduvlive/'), ('D:\\Excel Byforgation\\live work\\live work\\shared', 'shared/')],
+    hiddenimports=['pandas', 'openpyxl', 'PIL', 'tqdm', 'python_calamine'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
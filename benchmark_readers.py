@@ -0,0 +1,52 @@
+import argparse
+import os
+import sys
+import time
+
+# Shared helpers live in ./shared
+current_dir = os.path.dirname(os.path.abspath(__file__))
+shared_path = os.path.join(current_dir, 'shared')
+if shared_path not in sys.path:
+    sys.path.append(shared_path)
+
+from excel_reader import available_backends, read_excel
+from excel_stream import iter_excel_chunks
+from memory_budget import format_bytes
+
+
+def _stream_all(file_path):
+    rows = 0
+    cols = 0
+    for chunk in iter_excel_chunks(file_path, 10000):
+        rows += len(chunk)
+        cols = len(chunk.columns)
+    return rows, cols
+
+
+def benchmark(file_path, repeat=3):
+    """Best-of-`repeat` read time per backend on the same workbook."""
+    size = os.path.getsize(file_path)
+    readers = [(name, lambda name=name: read_excel(file_path, name).shape) for name in available_backends()]
+    readers.append(("openpyxl (read-only stream)", lambda: _stream_all(file_path)))
+
+    print(f"📊 {file_path} ({format_bytes(size)}), best of {repeat}")
+    print(f"{'backend':<28}{'seconds':>10}{'rows/s':>12}{'cells/s':>14}{'MB/s':>8}")
+    results = {}
+    for name, read in readers:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            rows, cols = read()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = best
+        print(f"{name:<28}{best:>10.2f}{rows / best:>12,.0f}{rows * cols / best:>14,.0f}{size / best / 1024 ** 2:>8.1f}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare Excel reader backends on one workbook")
+    parser.add_argument("file_path")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    benchmark(args.file_path, args.repeat)
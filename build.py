@@ -10,6 +10,7 @@ customtkinter_path = os.path.dirname(customtkinter.__file__)
 current_dir = os.path.dirname(os.path.abspath(__file__))
 res_path = os.path.join(current_dir, 'reslivemain')
 manage_path = os.path.join(current_dir, 'resvaduvlive')
+shared_path = os.path.join(current_dir, 'shared')
 
 print("Building Real Estate Manager...")
 
@@ -25,11 +26,13 @@ PyInstaller.__main__.run([
     # Add our script folders
     f'--add-data={res_path};reslivemain/',
     f'--add-data={manage_path};resvaduvlive/',
+    f'--add-data={shared_path};shared/',
     # Hidden imports might be needed since we import dynamically
     '--hidden-import=pandas',
     '--hidden-import=openpyxl',
     '--hidden-import=PIL',
     '--hidden-import=tqdm',
+    '--hidden-import=python_calamine',
 ])
 
 print("Build complete. Check dist/RealEstateManager folder.")
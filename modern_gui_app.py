@@ -18,12 +18,15 @@ else:
 
 res_script_path = os.path.join(current_dir, 'reslivemain')
 manage_script_path = os.path.join(current_dir, 'resvaduvlive')
+shared_path = os.path.join(current_dir, 'shared')
 
 # Add to sys.path if not already present
 if res_script_path not in sys.path:
     sys.path.append(res_script_path)
 if manage_script_path not in sys.path:
     sys.path.append(manage_script_path)
+if shared_path not in sys.path:
+    sys.path.append(shared_path)
 
 # Import residentialscript
 residentialscript = None
@@ -43,6 +46,9 @@ except ImportError as e:
     manage_error = str(e)
     print(f"Error importing manage_builtup_area: {e}")
 
+# Excel reader backend choices ("auto" picks the fastest installed one)
+READER_CHOICES = ["auto", "calamine", "openpyxl"]
+
 ctk.set_appearance_mode("System")  # Modes: "System" (standard), "Dark", "Light"
 ctk.set_default_color_theme("blue")  # Themes: "blue" (standard), "green", "dark-blue"
 
@@ -93,15 +99,26 @@ class App(ctk.CTk):
         self.res_browse_btn = ctk.CTkButton(self.home_frame, text="Browse", command=self.browse_res_file)
         self.res_browse_btn.grid(row=1, column=1, padx=20, pady=10)
 
+        self.res_options_frame = ctk.CTkFrame(self.home_frame, fg_color="transparent")
+        self.res_options_frame.grid(row=2, column=0, padx=20, pady=0, sticky="ew", columnspan=2)
+        self.res_memory_entry = ctk.CTkEntry(self.res_options_frame, width=160, placeholder_text="Max memory (e.g. 2GB)")
+        self.res_memory_entry.grid(row=0, column=0, padx=(0, 10), pady=0, sticky="w")
+        self.res_reader_menu = ctk.CTkOptionMenu(self.res_options_frame, width=120, values=READER_CHOICES)
+        self.res_reader_menu.grid(row=0, column=1, padx=(0, 10), pady=0, sticky="w")
+        self.res_preview_btn = ctk.CTkButton(self.res_options_frame, text="Preview", width=100, command=self.preview_residential_script)
+        self.res_preview_btn.grid(row=0, column=2, padx=(0, 10), pady=0, sticky="w")
+        self.res_resume_check = ctk.CTkCheckBox(self.res_options_frame, text="Resume interrupted run")
+        self.res_resume_check.grid(row=0, column=3, padx=(0, 10), pady=0, sticky="w")
+
         self.res_run_btn = ctk.CTkButton(self.home_frame, text="Run Process", command=self.run_residential_script)
-        self.res_run_btn.grid(row=2, column=0, padx=20, pady=10, sticky="ew")
+        self.res_run_btn.grid(row=3, column=0, padx=20, pady=10, sticky="ew")
 
         self.res_open_btn = ctk.CTkButton(self.home_frame, text="Open Output Folder", command=self.open_res_output, state="disabled", fg_color="green")
-        self.res_open_btn.grid(row=2, column=1, padx=20, pady=10, sticky="ew")
+        self.res_open_btn.grid(row=3, column=1, padx=20, pady=10, sticky="ew")
 
         self.res_log_box = ctk.CTkTextbox(self.home_frame, width=400, height=300)
-        self.res_log_box.grid(row=3, column=0, padx=20, pady=10, sticky="nsew", columnspan=2)
-        self.home_frame.grid_rowconfigure(3, weight=1)
+        self.res_log_box.grid(row=4, column=0, padx=20, pady=10, sticky="nsew", columnspan=2)
+        self.home_frame.grid_rowconfigure(4, weight=1)
 
         # create second frame (Manage Builtup)
         self.second_frame = ctk.CTkFrame(self, corner_radius=0, fg_color="transparent")
@@ -120,15 +137,26 @@ class App(ctk.CTk):
         self.floor_browse_btn = ctk.CTkButton(self.second_frame, text="Browse", command=self.browse_floor_file)
         self.floor_browse_btn.grid(row=2, column=1, padx=20, pady=10)
 
+        self.manage_options_frame = ctk.CTkFrame(self.second_frame, fg_color="transparent")
+        self.manage_options_frame.grid(row=3, column=0, padx=20, pady=0, sticky="ew", columnspan=2)
+        self.manage_memory_entry = ctk.CTkEntry(self.manage_options_frame, width=160, placeholder_text="Max memory (e.g. 2GB)")
+        self.manage_memory_entry.grid(row=0, column=0, padx=(0, 10), pady=0, sticky="w")
+        self.manage_reader_menu = ctk.CTkOptionMenu(self.manage_options_frame, width=120, values=READER_CHOICES)
+        self.manage_reader_menu.grid(row=0, column=1, padx=(0, 10), pady=0, sticky="w")
+        self.manage_preview_btn = ctk.CTkButton(self.manage_options_frame, text="Preview", width=100, command=self.preview_manage_script)
+        self.manage_preview_btn.grid(row=0, column=2, padx=(0, 10), pady=0, sticky="w")
+        self.manage_resume_check = ctk.CTkCheckBox(self.manage_options_frame, text="Resume interrupted run")
+        self.manage_resume_check.grid(row=0, column=3, padx=(0, 10), pady=0, sticky="w")
+
         self.manage_run_btn = ctk.CTkButton(self.second_frame, text="Run Process", command=self.run_manage_script)
-        self.manage_run_btn.grid(row=3, column=0, padx=20, pady=10, sticky="ew")
+        self.manage_run_btn.grid(row=4, column=0, padx=20, pady=10, sticky="ew")
 
         self.manage_open_btn = ctk.CTkButton(self.second_frame, text="Open Output Folder", command=self.open_manage_output, state="disabled", fg_color="green")
-        self.manage_open_btn.grid(row=3, column=1, padx=20, pady=10, sticky="ew")
+        self.manage_open_btn.grid(row=4, column=1, padx=20, pady=10, sticky="ew")
 
         self.manage_log_box = ctk.CTkTextbox(self.second_frame, width=400, height=300)
-        self.manage_log_box.grid(row=4, column=0, padx=20, pady=10, sticky="nsew", columnspan=2)
-        self.second_frame.grid_rowconfigure(4, weight=1)
+        self.manage_log_box.grid(row=5, column=0, padx=20, pady=10, sticky="nsew", columnspan=2)
+        self.second_frame.grid_rowconfigure(5, weight=1)
 
         # select default frame
         self.select_frame_by_name("home")
@@ -203,6 +231,9 @@ class App(ctk.CTk):
 
     def run_residential_script(self):
         file_path = self.res_file_entry.get()
+        max_memory = self.res_memory_entry.get().strip() or None
+        reader = self.res_reader_menu.get()
+        resume = bool(self.res_resume_check.get())
         if not file_path:
             messagebox.showerror("Error", "Please select an input file.")
             return
@@ -214,7 +245,7 @@ class App(ctk.CTk):
         def task():
             try:
                 if residentialscript:
-                    output = residentialscript.process_residential_data(file_path, log_callback=self.log_res)
+                    output = residentialscript.process_residential_data(file_path, log_callback=self.log_res, max_memory=max_memory, reader=reader, resume=resume)
                     if output and os.path.exists(output):
                         self.res_output_path = output
                         self.res_open_btn.configure(state="normal")
@@ -232,9 +263,35 @@ class App(ctk.CTk):
         
         threading.Thread(target=task, daemon=True).start()
 
+    def preview_residential_script(self):
+        file_path = self.res_file_entry.get()
+        reader = self.res_reader_menu.get()
+        if not file_path:
+            messagebox.showerror("Error", "Please select an input file.")
+            return
+
+        self.res_log_box.delete("1.0", "end")
+        self.res_preview_btn.configure(state="disabled")
+
+        def task():
+            try:
+                if residentialscript:
+                    residentialscript.preview_residential_data(file_path, log_callback=self.log_res, reader=reader)
+                else:
+                    self.log_res(f"Error: residentialscript module not loaded.\nDetails: {residential_error}")
+            except Exception as e:
+                self.log_res(f"Critical Error: {e}")
+            finally:
+                self.res_preview_btn.configure(state="normal")
+
+        threading.Thread(target=task, daemon=True).start()
+
     def run_manage_script(self):
         area_file = self.area_file_entry.get()
         floor_file = self.floor_file_entry.get()
+        max_memory = self.manage_memory_entry.get().strip() or None
+        reader = self.manage_reader_menu.get()
+        resume = bool(self.manage_resume_check.get())
 
         if not area_file or not floor_file:
             messagebox.showerror("Error", "Please select both Area and Floor files.")
@@ -247,7 +304,7 @@ class App(ctk.CTk):
         def task():
             try:
                 if manage_builtup_area:
-                    output = manage_builtup_area.main(area_file, floor_file, log_callback=self.log_manage)
+                    output = manage_builtup_area.main(area_file, floor_file, log_callback=self.log_manage, max_memory=max_memory, reader=reader, resume=resume)
                     if output and os.path.exists(output):
                         self.manage_output_path = output
                         self.manage_open_btn.configure(state="normal")
@@ -265,6 +322,31 @@ class App(ctk.CTk):
 
         threading.Thread(target=task, daemon=True).start()
 
+    def preview_manage_script(self):
+        area_file = self.area_file_entry.get()
+        floor_file = self.floor_file_entry.get()
+        reader = self.manage_reader_menu.get()
+
+        if not area_file or not floor_file:
+            messagebox.showerror("Error", "Please select both Area and Floor files.")
+            return
+
+        self.manage_log_box.delete("1.0", "end")
+        self.manage_preview_btn.configure(state="disabled")
+
+        def task():
+            try:
+                if manage_builtup_area:
+                    manage_builtup_area.preview(area_file, floor_file, log_callback=self.log_manage, reader=reader)
+                else:
+                    self.log_manage(f"Error: manage_builtup_area module not loaded.\nDetails: {manage_error}")
+            except Exception as e:
+                self.log_manage(f"Critical Error: {e}")
+            finally:
+                self.manage_preview_btn.configure(state="normal")
+
+        threading.Thread(target=task, daemon=True).start()
+
 if __name__ == "__main__":
     app = App()
     app.mainloop()
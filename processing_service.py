@@ -0,0 +1,250 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Shared helpers (job runner) live in ./shared
+current_dir = os.path.dirname(os.path.abspath(__file__))
+shared_path = os.path.join(current_dir, 'shared')
+if shared_path not in sys.path:
+    sys.path.append(shared_path)
+
+import jobs
+
+LOG_LINES_KEPT = 200
+
+
+# ------------------------------------------------------------
+# WORKER SIDE (runs inside the process pool)
+# ------------------------------------------------------------
+_events = None
+
+
+def _init_worker(events):
+    """Keep the event queue and import pandas/openpyxl once per worker."""
+    global _events
+    _events = events
+    jobs.load_modules()
+
+
+def _execute(job_id, job_type, kwargs):
+    """Run a job, returning (output path, last error line logged by the script)."""
+    _events.put((job_id, "start", None))
+    errors = []
+
+    def log(msg):
+        msg = str(msg)
+        if "❌" in msg:
+            errors.append(msg.strip())
+        _events.put((job_id, "log", msg))
+
+    output = jobs.run_job(job_type, kwargs, log_callback=log)
+    return output, errors[-1] if errors else None
+
+
+# ------------------------------------------------------------
+# JOB STORE (service side)
+# ------------------------------------------------------------
+class JobStore:
+    def __init__(self, make_pool, events, workers):
+        self.make_pool = make_pool
+        self.pool = make_pool()
+        self.workers = workers
+        self.events = events
+        self.lock = threading.Lock()
+        self.pool_lock = threading.Lock()
+        self.jobs = {}
+        threading.Thread(target=self._listen, daemon=True).start()
+
+    def submit(self, job_type, params):
+        kwargs = jobs.validate_job(job_type, params)
+        job_id = uuid.uuid4().hex[:12]
+        job = {
+            "id": job_id,
+            "type": job_type,
+            "params": kwargs,
+            "status": "queued",
+            "progress": {"done": 0, "total": None, "percent": None},
+            "log": deque(maxlen=LOG_LINES_KEPT),
+            "result": None,
+            "error": None,
+            "created": time.time(),
+            "started": None,
+            "finished": None,
+        }
+        with self.lock:
+            self.jobs[job_id] = job
+        try:
+            future = self._submit(job_id, job_type, kwargs)
+        except Exception as e:
+            with self.lock:
+                job.update(status="failed", error=f"{type(e).__name__}: {e}", finished=time.time())
+            return job_id
+        future.add_done_callback(lambda f: self._finish(job_id, f))
+        return job_id
+
+    def _submit(self, job_id, job_type, kwargs):
+        """Submit to the pool, replacing it once if a dead worker (e.g. OOM kill) broke it."""
+        with self.pool_lock:
+            try:
+                return self.pool.submit(_execute, job_id, job_type, kwargs)
+            except BrokenProcessPool:
+                print("⚠️ A worker process died; restarting the process pool")
+                self.pool.shutdown(wait=False, cancel_futures=True)
+                self.pool = self.make_pool()
+                return self.pool.submit(_execute, job_id, job_type, kwargs)
+
+    def shutdown(self):
+        with self.pool_lock:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def _listen(self):
+        while True:
+            job_id, kind, payload = self.events.get()
+            with self.lock:
+                job = self.jobs.get(job_id)
+                if job is None:
+                    continue
+                if kind == "start" and job["status"] == "queued":
+                    job["status"] = "running"
+                    job["started"] = time.time()
+                elif kind == "log":
+                    job["log"].append(payload)
+                    progress = jobs.parse_progress(payload)
+                    if progress:
+                        done, total = progress
+                        job["progress"] = {"done": done, "total": total,
+                                           "percent": round(done / total * 100, 1) if total else None}
+
+    def _finish(self, job_id, future):
+        with self.lock:
+            job = self.jobs[job_id]
+            job["finished"] = time.time()
+            try:
+                output, error = future.result()
+            except Exception as e:
+                job["status"] = "failed"
+                job["error"] = f"{type(e).__name__}: {e}"
+                return
+            if output and os.path.exists(output):
+                job["status"] = "done"
+                job["result"] = output
+                if job["progress"]["total"]:
+                    job["progress"]["percent"] = 100.0
+            else:
+                job["status"] = "failed"
+                job["error"] = error or "Job produced no output"
+
+    def summary(self, job_id):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            return {k: v for k, v in job.items() if k != "log"}
+
+    def recent_log(self, job_id):
+        with self.lock:
+            return list(self.jobs[job_id]["log"])
+
+    def list(self):
+        with self.lock:
+            ids = list(self.jobs)
+        return [self.summary(job_id) for job_id in ids]
+
+
+# ------------------------------------------------------------
+# HTTP API
+# ------------------------------------------------------------
+class Handler(BaseHTTPRequestHandler):
+    store = None
+
+    def _send(self, status, body):
+        data = json.dumps(body, ensure_ascii=False, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _parts(self):
+        return [p for p in self.path.split("?")[0].split("/") if p]
+
+    def do_GET(self):
+        parts = self._parts()
+        if parts == ["health"]:
+            return self._send(200, {"status": "ok", "workers": self.store.workers})
+        if parts == ["jobs"]:
+            return self._send(200, self.store.list())
+        if len(parts) in (2, 3) and parts[0] == "jobs":
+            job = self.store.summary(parts[1])
+            if job is None:
+                return self._send(404, {"error": "Unknown job"})
+            if len(parts) == 2:
+                return self._send(200, job)
+            if parts[2] == "progress":
+                return self._send(200, {"id": job["id"], "status": job["status"], "progress": job["progress"],
+                                        "log": self.store.recent_log(job["id"])})
+            if parts[2] == "result":
+                if job["status"] == "done":
+                    return self._send(200, {"id": job["id"], "output_file": job["result"]})
+                if job["status"] == "failed":
+                    return self._send(500, {"id": job["id"], "error": job["error"]})
+                return self._send(409, {"id": job["id"], "status": job["status"], "error": "Job not finished"})
+        self._send(404, {"error": "Not found"})
+
+    def do_POST(self):
+        if self._parts() != ["jobs"]:
+            return self._send(404, {"error": "Not found"})
+        # a plain form or text/plain POST from a web page must not start jobs
+        if self.headers.get_content_type() != "application/json":
+            return self._send(415, {"error": "Content-Type must be application/json"})
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+            job_id = self.store.submit(body.get("type"), body)
+        except (ValueError, AttributeError) as e:
+            return self._send(400, {"error": str(e)})
+        job = self.store.summary(job_id)
+        if job["status"] == "failed":
+            return self._send(503, {"id": job_id, "status": "failed", "error": job["error"]})
+        self._send(202, {"id": job_id, "status": "queued"})
+
+    def log_message(self, format, *args):
+        print(f"[{self.log_date_time_string()}] {format % args}")
+
+
+def serve(host="127.0.0.1", port=8765, workers=2):
+    manager = multiprocessing.Manager()
+    events = manager.Queue()
+    Handler.store = JobStore(
+        lambda: ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(events,)),
+        events, workers)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    print(f"🚀 Processing service listening on http://{host}:{port} ({workers} workers)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Shutting down...")
+    finally:
+        server.server_close()
+        Handler.store.shutdown()
+        manager.shutdown()
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    parser = argparse.ArgumentParser(description="Local processing service for residential and builtup-area jobs")
+    parser.add_argument("--host", default="127.0.0.1", help="bind address (default: localhost only)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=2, help="number of worker processes")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.workers)
@@ -2,8 +2,20 @@ import pandas as pd
 import re
 import sys
 import unicodedata
-from datetime import datetime
 import os
+import argparse
+
+# Shared helpers live in ../shared (bundled next to this folder)
+SHARED_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared")
+if SHARED_DIR not in sys.path:
+    sys.path.append(SHARED_DIR)
+
+from excel_stream import iter_excel_chunks, excel_value, write_only_sheet
+from checkpoint import Checkpoint, checkpoint_dir
+from output_paths import reserve_output, release_output, sidecar_path
+from excel_reader import BACKENDS, is_forced, read_excel, select_backend
+from memory_budget import parse_memory, plan_for_file, MemoryMonitor
+from preview import PREVIEW_ROWS, PREVIEW_DISPLAY_ROWS, timed, sample_sheet, estimate_read, measure_write, extrapolate, describe
 
 # === Helper to clean description ===
 def clean_description(text):
@@ -114,33 +126,10 @@ def extract_area(description, totalarea, construction_type, unmatched_types):
     return ", ".join(raw_patterns) if raw_patterns else None, final_total, RCC, PR, C, E, OP
 
 
-def process_residential_data(file_path, log_callback=None):
-    def log(msg):
-        if log_callback:
-            log_callback(msg)
-        else:
-            print(msg)
-
-    log("🏗️ Starting Real Estate Data Cleaning (Final v8 with RCC + Parking Split)...")
-    
-    if not file_path:
-        log("❌ No file provided.")
-        return
-
-    log(f"📂 Reading file: {file_path}")
-
-    try:
-        df = pd.read_excel(file_path, engine="openpyxl")
-    except Exception as e:
-        log(f"❌ Error reading file: {e}")
-        return
-
-    total_rows = len(df)
-    log(f"📊 Total rows to process: {total_rows}")
-
-    # === 3️⃣ Process all rows ===
+def add_area_columns(df, unmatched_types, log, total_rows=None):
+    """Run extract_area over every row and append the split columns to df."""
+    total_rows = total_rows if total_rows is not None else len(df)
     raw_texts, areas, RCCs, PRs, Cs, Es, OPs = [], [], [], [], [], [], []
-    unmatched_types = set()
 
     for idx, row in df.iterrows():
         raw, area, rcc, pr, c, e, op = extract_area(
@@ -160,7 +149,6 @@ def process_residential_data(file_path, log_callback=None):
         if (idx + 1) % 2000 == 0:
             log(f"✅ Processed {idx + 1}/{total_rows} rows...")
 
-    # === 4️⃣ Add results ===
     df["Raw_Area_Text"] = raw_texts
     df["Area_R"] = areas
     df["RCC"] = RCCs
@@ -168,30 +156,258 @@ def process_residential_data(file_path, log_callback=None):
     df["C"] = Cs
     df["E"] = Es
     df["OP"] = OPs
+    return df
+
+
+# Rows per processing block; a checkpoint can only land between blocks
+CHECKPOINT_ROWS = 2000
+
+
+def _process_streaming(file_path, output_file, plan, unmatched_types, log, checkpoint, done_parts):
+    """Read, split and write in chunks so the whole sheet is never held in memory."""
+    header_written = False
+
+    def write(ws, part):
+        nonlocal header_written
+        if not header_written:
+            ws.append(list(part.columns))
+            header_written = True
+        for row in part.itertuples(index=False, name=None):
+            ws.append([excel_value(v) for v in row])
 
-    # === 5️⃣ Output ===
-    output_dir = os.path.dirname(file_path)
-    output_file = os.path.join(output_dir, f"Residential_bifurcation_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx")
+    with write_only_sheet("Sheet1") as (wb, ws):
+        # rows finished by a previous run come straight from the checkpoint
+        for part in done_parts:
+            write(ws, part)
+        done_parts.clear()
+
+        # blocks of at most CHECKPOINT_ROWS, so a checkpoint can land inside a large chunk
+        block_rows = min(plan.process_rows, CHECKPOINT_ROWS)
+        for chunk in iter_excel_chunks(file_path, plan.read_rows):
+            chunk = chunk[chunk.index >= checkpoint.done]
+            for start in range(0, len(chunk), block_rows):
+                part = add_area_columns(chunk.iloc[start:start + block_rows].copy(), unmatched_types, log, plan.total_rows)
+                write(ws, part)
+                checkpoint.add(part, int(part.index[-1]) + 1)
+            del chunk
+
+        wb.save(output_file)
+
+
+def process_residential_data(file_path, log_callback=None, max_memory=None, reader=None, resume=False):
+    def log(msg):
+        if log_callback:
+            log_callback(msg)
+        else:
+            print(msg)
+
+    log("🏗️ Starting Real Estate Data Cleaning (Final v8 with RCC + Parking Split)...")
     
+    if not file_path:
+        log("❌ No file provided.")
+        return
+
+    budget = None
     try:
-        df.to_excel(output_file, index=False)
-        log(f"🎉 Cleaning complete! (Smart Split for RCC + Parking + मिश्र + L×B)")
-        log(f"📁 Output saved as: {output_file}")
-    except Exception as e:
-        log(f"❌ Error saving file: {e}")
+        backend = select_backend(reader)
+        if max_memory:
+            budget = parse_memory(max_memory)
+    except ValueError as e:
+        log(f"❌ {e}")
+        return
+
+    try:
+        output_file = reserve_output(os.path.dirname(file_path), "Residential_bifurcation", file_path)
+    except OSError as e:
+        log(f"❌ Cannot create output file: {e}")
         return
 
+    monitor = MemoryMonitor().start() if budget else None
+    checkpoint = Checkpoint(checkpoint_dir("residential", [file_path]), [file_path])
+    result = None
+    try:
+        result = _run(file_path, output_file, log, budget, monitor, backend, is_forced(reader), resume, checkpoint)
+        return result
+    finally:
+        checkpoint.close()
+        if result is None:
+            release_output(output_file)
+        if monitor:
+            monitor.stop()
+            log(monitor.report(budget))
+
+
+def _run(file_path, output_file, log, budget, monitor, backend, forced, resume, checkpoint):
+    log(f"📂 Reading file: {file_path}")
+
+    plan = None
+    if budget:
+        try:
+            plan = plan_for_file(file_path, budget, baseline=monitor.start_rss)
+        except Exception as e:
+            log(f"❌ Error reading file: {e}")
+            return
+        log(plan.describe())
+
+    unmatched_types = set()
+
+    try:
+        done_parts = checkpoint.start(resume, log)
+    except Exception as e:
+        log(f"⚠️ Could not load checkpoint ({e}), starting from the beginning")
+        checkpoint.discard()
+        done_parts = []
+    unmatched_types.update(checkpoint.state.get("unmatched_types", []))
+    checkpoint.state["unmatched_types"] = unmatched_types
+
+    if plan and not plan.fits:
+        if plan.total_rows is not None:
+            log(f"📊 Total rows to process: {plan.total_rows}")
+        if forced and backend != "openpyxl":
+            log(f"⚠️ Reader {backend} is overridden: chunked processing needs the openpyxl read-only stream")
+        log("📖 Reader: openpyxl (read-only stream)")
+        try:
+            _process_streaming(file_path, output_file, plan, unmatched_types, log, checkpoint, done_parts)
+            log(f"🎉 Cleaning complete! (Smart Split for RCC + Parking + मिश्र + L×B)")
+            log(f"📁 Output saved as: {output_file}")
+        except BaseException as e:
+            checkpoint.flush()
+            log(f"💾 Progress checkpointed ({checkpoint.done} rows); rerun with resume to continue")
+            if not isinstance(e, Exception):
+                raise
+            log(f"❌ Error processing file in chunks: {e}")
+            return
+    else:
+        try:
+            log(f"📖 Reader: {backend}")
+            df = read_excel(file_path, backend)
+        except Exception as e:
+            log(f"❌ Error reading file: {e}")
+            return
+
+        total_rows = len(df)
+        log(f"📊 Total rows to process: {total_rows}")
+
+        # === 3️⃣ Process all rows ===
+        # full blocks only live in the checkpoint until flushed; only the result columns are kept here
+        resumed = checkpoint.done
+        results = []
+        try:
+            for start in range(resumed, total_rows, CHECKPOINT_ROWS):
+                block = add_area_columns(df.iloc[start:start + CHECKPOINT_ROWS].copy(), unmatched_types, log, total_rows)
+                checkpoint.add(block, start + len(block))
+                results.append(block[OUTPUT_COLUMNS])
+                del block
+        except BaseException:
+            checkpoint.flush()
+            log(f"💾 Progress checkpointed ({checkpoint.done} rows); rerun with resume to continue")
+            raise
+
+        # === 4️⃣ Add results ===
+        if results:
+            df = df.iloc[resumed:]
+            new_columns = pd.concat(results)
+            del results
+            for col in OUTPUT_COLUMNS:
+                df[col] = new_columns[col]
+            del new_columns
+        elif not done_parts:
+            df = add_area_columns(df, unmatched_types, log, total_rows)
+        if done_parts:
+            df = pd.concat(done_parts + ([df] if resumed < total_rows else []))
+            done_parts.clear()
+
+        # === 5️⃣ Output ===
+        try:
+            df.to_excel(output_file, index=False)
+            log(f"🎉 Cleaning complete! (Smart Split for RCC + Parking + मिश्र + L×B)")
+            log(f"📁 Output saved as: {output_file}")
+        except Exception as e:
+            log(f"❌ Error saving file: {e}")
+            checkpoint.done = total_rows
+            checkpoint.flush()
+            log("💾 Results checkpointed; rerun with resume to only write the output")
+            return
+
+    checkpoint.discard()
+
     # === 6️⃣ Write unmatched safely ===
     if unmatched_types:
         unmatched_clean = [str(u) for u in unmatched_types if isinstance(u, str) and u.strip()]
         unmatched_clean = sorted(list(set(unmatched_clean)))
-        unmatched_file = os.path.join(output_dir, "unmatched_construction_types.txt")
+        unmatched_file = sidecar_path(output_file, "_unmatched_construction_types.txt")
         with open(unmatched_file, "w", encoding="utf-8") as f:
             f.write("\n".join(unmatched_clean))
         log(f"⚠️ {len(unmatched_clean)} unmatched construction types written to {unmatched_file}")
 
     return output_file
 
+# === 🔍 Preview / dry run ===
+INPUT_COLUMNS = ["description", "totalarea", "finalconstructiontype"]
+OUTPUT_COLUMNS = ["Raw_Area_Text", "Area_R", "RCC", "PR", "C", "E", "OP"]
+
+
+def preview_residential_data(file_path, n_rows=PREVIEW_ROWS, log_callback=None, reader=None):
+    """Run the split on the first n_rows only and extrapolate the full run."""
+    def log(msg):
+        if log_callback:
+            log_callback(msg)
+        else:
+            print(msg)
+
+    try:
+        backend = select_backend(reader)
+    except ValueError as e:
+        log(f"❌ {e}")
+        return
+
+    log(f"🔍 Preview of {file_path} (first {n_rows} rows, reader: {backend})")
+    try:
+        sample, total_rows, open_s, rows_s = sample_sheet(file_path, n_rows, backend)
+    except Exception as e:
+        log(f"❌ Error reading file: {e}")
+        return
+
+    if sample.empty:
+        log("❌ No data rows found.")
+        return
+
+    missing = [c for c in INPUT_COLUMNS if c not in sample.columns]
+    if missing:
+        log(f"⚠️ Missing columns (treated as empty): {missing}\nColumns available: {list(sample.columns)}")
+    else:
+        log(f"✅ Columns found: {INPUT_COLUMNS}")
+
+    unmatched_types = set()
+    out, process_s = timed(add_area_columns, sample.copy(), unmatched_types, lambda msg: None)
+    write_s = measure_write(out)
+
+    read_s = estimate_read(open_s, rows_s, len(sample), total_rows)
+    factor = total_rows / len(sample) if total_rows is not None else 1
+    estimate = extrapolate(len(sample), total_rows, read_s, process_s * factor, write_s, out)
+
+    shown = [c for c in INPUT_COLUMNS + OUTPUT_COLUMNS if c in out.columns]
+    log(out[shown].head(PREVIEW_DISPLAY_ROWS).to_string())
+    if unmatched_types:
+        log(f"⚠️ Unmatched construction types in sample: {sorted(str(u) for u in unmatched_types)}")
+    log(describe(estimate))
+
+    estimate["sample"] = out
+    return estimate
+
+
 if __name__ == "__main__":
-    file_path = sys.argv[1] if len(sys.argv) > 1 else "input.xlsx"
-    process_residential_data(file_path)
+    parser = argparse.ArgumentParser(description="Residential area bifurcation")
+    parser.add_argument("file_path", nargs="?", default="input.xlsx")
+    parser.add_argument("--max-memory", help="memory budget, e.g. 2GB; large inputs are processed in chunks")
+    parser.add_argument("--reader", choices=["auto"] + BACKENDS, help="Excel reader backend (default: fastest installed)")
+    parser.add_argument("--resume", action="store_true", help="continue from the last checkpoint of an interrupted run")
+    parser.add_argument("--preview", type=int, nargs="?", const=PREVIEW_ROWS, metavar="N",
+                        help="dry run on the first N rows and estimate the full run")
+    args = parser.parse_args()
+    if args.preview is not None and args.preview < 1:
+        parser.error("--preview N must be at least 1")
+    if args.preview is not None:
+        preview_residential_data(args.file_path, args.preview, reader=args.reader)
+    else:
+        process_residential_data(args.file_path, max_memory=args.max_memory, reader=args.reader, resume=args.resume)
@@ -1,33 +1,127 @@
 import pandas as pd
 import numpy as np
 import sys
+import re
+import json
+import math
 import time
 import os
-from datetime import datetime
+import argparse
 from pathlib import Path
 from openpyxl import load_workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import PatternFill
 from tqdm import tqdm
 
+# Shared helpers live in ../shared (bundled next to this folder)
+SHARED_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared")
+if SHARED_DIR not in sys.path:
+    sys.path.append(SHARED_DIR)
+
+from excel_stream import excel_value, write_only_sheet
+from checkpoint import Checkpoint, checkpoint_dir
+from output_paths import reserve_output, release_output
+from excel_reader import BACKENDS, read_excel, select_backend
+from memory_budget import (parse_memory, plan_for_file, plan_chunks, estimate_row_bytes, estimate_split_bytes,
+                           group_chunk_size, current_rss, MemoryMonitor, format_bytes)
+from preview import PREVIEW_ROWS, PREVIEW_DISPLAY_ROWS, timed, sample_sheet, estimate_read, measure_write, extrapolate, describe
+
 
 # ------------------------------------------------------------
 # FLOOR ORDER LOGIC
 # ------------------------------------------------------------
-def logical_floor_order(floor):
+# FloorOrder is an integer sort key: level * FLOOR_KEY_SCALE, so half levels
+# (UG / LG) fit between whole floors. Unknown or blank floors sort last.
+FLOOR_KEY_SCALE = 10
+UNKNOWN_FLOOR = 10 ** 6
+
+# Spelling -> level. Keys are upper-cased with spaces, dots and hyphens removed
+# and a trailing "FLOOR"/"मजला" dropped. Extend or override with a
+# floor_order.json next to this script, e.g. {"STILT": 0, "PODIUM": 0.5}.
+FLOOR_LEVELS = {
+    "G": 0, "GF": 0, "GR": 0, "GRD": 0, "GROUND": 0,
+    "UG": 0.5, "UGF": 0.5, "UPPERGROUND": 0.5,
+    "LG": -0.5, "LGF": -0.5, "LOWERGROUND": -0.5,
+    "B": -1, "BASE": -1, "BASEMENT": -1,
+    "T": 100, "TER": 100, "TERRACE": 100,
+    # Marathi
+    "तळ": 0, "तळमजला": 0, "तळघर": -1, "गच्ची": 100, "टेरेस": 100,
+    "पहिला": 1, "दुसरा": 2, "तिसरा": 3, "चौथा": 4, "पाचवा": 5,
+    "सहावा": 6, "सातवा": 7, "आठवा": 8, "नववा": 9, "दहावा": 10,
+}
+FLOOR_TABLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "floor_order.json")
+
+FLOOR_CLEAN = re.compile(r"[\s.\-_]+")
+FLOOR_SUFFIX = re.compile(r"(FLOOR|FLR|FL|मजला)$")
+# (pattern, sign, offset): level = sign * number + offset
+FLOOR_PATTERNS = [
+    (re.compile(r"^(\d+)(ST|ND|RD|TH)?$"), 1, 0),                  # 1, 1ST, 2ND ...
+    (re.compile(r"^(?:FLOOR|FLR|FL|LEVEL|LVL|F|L)(\d+)$"), 1, 0),  # F1, L2, FLOOR 3, LEVEL-2
+    (re.compile(r"^(?:BASEMENT|BASE|B)(\d+)$"), -1, 0),            # B1, BASEMENT 2 (basements)
+    (re.compile(r"^P(\d+)$"), -1, 0.2),                            # P1, P2 (parking, just above the same basement)
+]
+
+
+def load_floor_table(path=FLOOR_TABLE_FILE):
+    """Built-in FLOOR_LEVELS merged with the optional JSON override file."""
+    table = dict(FLOOR_LEVELS)
+    if not path or not os.path.exists(path):
+        return table
+    with open(path, encoding="utf-8") as f:
+        try:
+            overrides = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path}: not valid JSON ({e})")
+    if not isinstance(overrides, dict):
+        raise ValueError(f"{path}: expected an object mapping floor spelling to level")
+    for name, level in overrides.items():
+        if isinstance(level, bool) or not isinstance(level, (int, float)) or not math.isfinite(level):
+            raise ValueError(f"{path}: level for {name!r} must be a number, got {level!r}")
+        table[_floor_token(name)] = level
+    return table
+
+
+def _floor_token(floor):
+    token = FLOOR_CLEAN.sub("", str(floor).strip().upper())
+    return FLOOR_SUFFIX.sub("", token) or token
+
+
+def logical_floor_order(floor, table=None):
+    """Integer sort key for one FloorID value."""
     if pd.isna(floor):
-        return np.inf
-    floor = str(floor).strip().upper()
-    if floor == "G":
-        return 0
-    try:
-        return int(floor)
-    except ValueError:
-        if "BASE" in floor:
-            return -1
-        elif "TERRACE" in floor or floor == "T":
-            return 100
+        return UNKNOWN_FLOOR
+    table = FLOOR_LEVELS if table is None else table
+    token = _floor_token(floor)
+
+    level = table.get(token)
+    if level is None:
+        try:
+            level = float(str(floor).strip())  # 2, 2.0, -1 and Devanagari digits
+        except ValueError:
+            for pattern, sign, offset in FLOOR_PATTERNS:
+                m = pattern.match(token)
+                if m:
+                    level = sign * int(m.group(1)) + offset
+                    break
+    if level is not None and not math.isfinite(level):
+        level = None
+    if level is None:
+        if "BASE" in token:
+            level = -1
+        elif "TERRACE" in token:
+            level = 100
         else:
-            return np.inf
+            return UNKNOWN_FLOOR
+    return int(round(level * FLOOR_KEY_SCALE))
+
+
+def floor_order_keys(floors, table=None):
+    """Vectorized logical_floor_order: computed once per distinct FloorID, mapped back by code."""
+    table = load_floor_table() if table is None else table
+    codes, uniques = pd.factorize(floors)
+    keys = np.fromiter((logical_floor_order(u, table) for u in uniques), dtype=np.int64, count=len(uniques))
+    # code -1 (blank FloorID) picks the trailing UNKNOWN_FLOOR
+    return np.append(keys, UNKNOWN_FLOOR)[codes]
 
 
 # ------------------------------------------------------------
@@ -54,7 +148,7 @@ def process_property(prop_code, area_r, df_prop):
     df_valid = df_prop[df_prop["TypeOFUse"].isin(valid_types)].copy()
     df_other = df_prop[~df_prop["TypeOFUse"].isin(valid_types)].copy()
 
-    df_valid = df_valid.sort_values(by="FloorOrder").reset_index(drop=True)
+    df_valid = df_valid.sort_values(by="FloorOrder", kind="stable").reset_index(drop=True)
 
     for idx, row in df_valid.iterrows():
 
@@ -143,22 +237,164 @@ def process_property(prop_code, area_r, df_prop):
     return df_out
 
 
+def normalize_columns(df_area, df_floor):
+    """Detect the input columns and rename them in place; raises KeyError if one is missing."""
+    prop_area = detect_column(df_area, ["PropertyCode"])
+    area_col = detect_column(df_area, ["Area_R", "AreaR", "TotalArea"])
+
+    prop_floor = detect_column(df_floor, ["PropertyCode", "propertycode"])
+    floor_col = detect_column(df_floor, ["FloorID", "Floor", "Floor Id"])
+    builtup_col = detect_column(df_floor, ["BuiltupAreaSqFeet", "BuiltUpArea", "BuiltupAreaSqft"])
+    type_col = detect_column(df_floor, ["TypeOFUse", "TypeOfUse"])
+    year_col = detect_column(df_floor, ["ConstructionYear", "Year"])
+    carpet_col = detect_column(df_floor, ["CarpetAreaSqFeet", "CarpetArea"])
+
+    # Normalize names
+    mapping = {
+        prop_floor: "PropertyCode",
+        floor_col: "FloorID",
+        builtup_col: "BuiltupAreaSqFeet",
+        type_col: "TypeOFUse",
+        year_col: "ConstructionYear",
+        carpet_col: "CarpetAreaSqFeet"
+    }
+    df_area.rename(columns={prop_area: "PropertyCode", area_col: "Area_R"}, inplace=True)
+    df_floor.rename(columns=mapping, inplace=True)
+    return {**{prop_area: "PropertyCode", area_col: "Area_R"}, **mapping}
+
+
+# ------------------------------------------------------------
+# PER-PROPERTY SPLIT
+# ------------------------------------------------------------
+VALID_TYPES = ["R", "WR", "SR", "PG", "HO", "ICR"]
+
+
+def split_property(prop, area_r, df_prop):
+    """Split one property's floors against its Area_R; None if nothing to output."""
+    if df_prop.empty or area_r <= 0:
+        return None
+
+    total_built = df_prop["BuiltupAreaSqFeet"].sum()
+
+    # Case: No split needed
+    if total_built <= area_r:
+
+        df_prop["SplitRow"] = np.where(df_prop["TypeOFUse"].isin(VALID_TYPES), "Balanced Part", "Non-Residential")
+        df_prop["Status"] = np.where(df_prop["TypeOFUse"].isin(VALID_TYPES), "Balanced", "Excess")
+
+        df_prop.loc[~df_prop["TypeOFUse"].isin(VALID_TYPES), "ConstructionYear"] = 2025
+        df_prop["PropertyCode"] = prop
+
+        return df_prop
+
+    out = process_property(prop, area_r, df_prop)
+    return out if not out.empty else None
+
+
+def _area_value(row):
+    return float(row["Area_R"]) if not pd.isna(row["Area_R"]) else 0
+
+
+# ------------------------------------------------------------
+# STREAMING (MEMORY BUDGET) HELPERS
+# ------------------------------------------------------------
+YELLOW = PatternFill(start_color="FFFF99", end_color="FFFF99", fill_type="solid")
+RED = PatternFill(start_color="FF9999", end_color="FF9999", fill_type="solid")
+
+
+def _row_fill(split_val, status_val):
+    if split_val in ["Balanced Part", "Overflow Split"]:
+        return YELLOW
+    if status_val == "Excess":
+        return RED
+    return None
+
+
+def _write_streaming(ws, df, columns):
+    split_i = columns.index("SplitRow")
+    status_i = columns.index("Status")
+    for values in df.reindex(columns=columns).itertuples(index=False, name=None):
+        fill = _row_fill(values[split_i], values[status_i])
+        row = []
+        for v in values:
+            cell = WriteOnlyCell(ws, value=excel_value(v))
+            if fill:
+                cell.fill = fill
+            row.append(cell)
+        ws.append(row)
+
+
 # ------------------------------------------------------------
 # MAIN SCRIPT
 # ------------------------------------------------------------
-def main(area_file, floor_file, log_callback=None):
+def main(area_file, floor_file, log_callback=None, max_memory=None, reader=None, resume=False):
     def log(msg):
         if log_callback:
             log_callback(msg)
         else:
             print(msg)
 
+    budget = None
+    try:
+        backend = select_backend(reader)
+        if max_memory:
+            budget = parse_memory(max_memory)
+    except ValueError as e:
+        log(f"❌ {e}")
+        return
+
+    # Timestamped output file, unique per job
+    try:
+        output_path = reserve_output(os.path.dirname(area_file), "Rvadiv", area_file)
+    except OSError as e:
+        log(f"❌ Cannot create output file: {e}")
+        return
+
+    monitor = MemoryMonitor().start() if budget else None
+    checkpoint = Checkpoint(checkpoint_dir("builtup", [area_file, floor_file]), [area_file, floor_file])
+    result = None
+    try:
+        result = _run(area_file, floor_file, output_path, log_callback, log, budget, monitor, backend, resume, checkpoint)
+        return result
+    finally:
+        checkpoint.close()
+        if result is None:
+            release_output(output_path)
+        if monitor:
+            monitor.stop()
+            log(monitor.report(budget))
+
+
+def _run(area_file, floor_file, output_path, log_callback, log, budget, monitor, backend, resume, checkpoint):
     log("\n🏗️ Starting Property Area Split & Proportional Carpet Calculation...\n")
     start = time.time()
 
+    area_plan = floor_plan = None
+    if budget:
+        try:
+            floor_plan = plan_for_file(floor_file, budget, baseline=monitor.start_rss)
+            area_plan = plan_for_file(area_file, budget, baseline=monitor.start_rss)
+        except Exception as e:
+            log(f"❌ Error reading files: {e}")
+            return
+        log(f"Floor file → {floor_plan.describe()}")
+        log(f"Area file → {area_plan.describe()}")
+        if floor_plan.total_rows is not None and area_plan.total_rows is not None:
+            floor_bytes = floor_plan.row_bytes * floor_plan.total_rows
+            full = estimate_split_bytes(floor_bytes + area_plan.row_bytes * area_plan.total_rows,
+                                        area_plan.total_rows, floor_bytes)
+            log(f"🧮 In-memory split incl. result frames and the colouring pass ≈ {format_bytes(full)}")
+
+    # With a budget the output is always streamed: collecting every property's
+    # result and colouring a loaded workbook costs several times the inputs.
+    # Properties are grouped across the whole floor sheet, so both inputs are
+    # loaded in full either way (with the selected reader)
+    streaming = bool(budget)
+
     try:
-        df_area = pd.read_excel(area_file, engine="openpyxl")
-        df_floor = pd.read_excel(floor_file, engine="openpyxl")
+        log(f"📖 Reader: {backend}")
+        df_area = read_excel(area_file, backend)
+        df_floor = read_excel(floor_file, backend)
     except Exception as e:
         log(f"❌ Error reading files: {e}")
         return
@@ -170,83 +406,81 @@ def main(area_file, floor_file, log_callback=None):
     log(f"📘 Area file loaded: {len(df_area)} rows")
     log(f"📗 Floor file loaded: {len(df_floor)} rows\n")
 
+    if streaming:
+        resident = estimate_row_bytes(df_floor) * len(df_floor) + estimate_row_bytes(df_area) * len(df_area)
+        if resident > budget - monitor.start_rss:
+            log(f"⚠️ Loaded inputs alone take ~{format_bytes(resident)}; the budget will likely be exceeded")
+        # process_rows counts floor rows; chunks are cut by property
+        chunk_plan = plan_chunks(budget, estimate_row_bytes(df_floor), len(df_floor), baseline=current_rss())
+        chunk_props = group_chunk_size(chunk_plan, len(df_floor) / max(len(df_area), 1))
+
     # Detect columns
     try:
-        prop_area = detect_column(df_area, ["PropertyCode"])
-        area_col = detect_column(df_area, ["Area_R", "AreaR", "TotalArea"])
-
-        prop_floor = detect_column(df_floor, ["PropertyCode", "propertycode"])
-        floor_col = detect_column(df_floor, ["FloorID", "Floor", "Floor Id"])
-        builtup_col = detect_column(df_floor, ["BuiltupAreaSqFeet", "BuiltUpArea", "BuiltupAreaSqft"])
-        type_col = detect_column(df_floor, ["TypeOFUse", "TypeOfUse"])
-        year_col = detect_column(df_floor, ["ConstructionYear", "Year"])
-        carpet_col = detect_column(df_floor, ["CarpetAreaSqFeet", "CarpetArea"])
+        normalize_columns(df_area, df_floor)
     except KeyError as e:
         log(str(e))
         return
 
-    # Normalize names
-    df_area.rename(columns={prop_area: "PropertyCode", area_col: "Area_R"}, inplace=True)
-    df_floor.rename(columns={
-        prop_floor: "PropertyCode",
-        floor_col: "FloorID",
-        builtup_col: "BuiltupAreaSqFeet",
-        type_col: "TypeOFUse",
-        year_col: "ConstructionYear",
-        carpet_col: "CarpetAreaSqFeet"
-    }, inplace=True)
-
     # Add sorted floor order
-    df_floor["FloorOrder"] = df_floor["FloorID"].apply(logical_floor_order)
+    try:
+        df_floor["FloorOrder"] = floor_order_keys(df_floor["FloorID"])
+    except ValueError as e:
+        log(f"❌ Invalid floor order table: {e}")
+        return
 
-    all_results = []
+    try:
+        all_results = checkpoint.start(resume, log)
+    except Exception as e:
+        log(f"⚠️ Could not load checkpoint ({e}), starting from the beginning")
+        checkpoint.discard()
+        all_results = []
+
+    if streaming:
+        try:
+            _run_streaming(df_area, df_floor, output_path, chunk_props, log, checkpoint, all_results)
+        except BaseException as e:
+            checkpoint.flush()
+            log(f"💾 Progress checkpointed ({checkpoint.done} properties); rerun with resume to continue")
+            if not isinstance(e, Exception):
+                raise
+            log(f"❌ Error processing properties in chunks: {e}")
+            return
+
+        checkpoint.discard()
+        log("\n✅ Process Completed Successfully!")
+        log(f"Output File: {output_path}")
+        log(f"Time Taken: {round(time.time() - start, 2)} seconds\n")
+        return output_path
 
     log(f"🏠 Processing properties...\n")
 
     # Use tqdm only if no callback, or just log progress periodically
-    iterator = df_area.iterrows()
+    remaining = df_area.iloc[checkpoint.done:]
+    iterator = remaining.iterrows()
     if not log_callback:
-        iterator = tqdm(df_area.iterrows(), total=len(df_area), ncols=90, desc="Processing")
+        iterator = tqdm(remaining.iterrows(), total=len(remaining), ncols=90, desc="Processing")
     
     total_props = len(df_area)
-    for idx, (index, row) in enumerate(iterator):
-        prop = row["PropertyCode"]
-        area_r = float(row["Area_R"]) if not pd.isna(row["Area_R"]) else 0
-        df_prop = df_floor[df_floor["PropertyCode"] == prop].copy()
-
-        if df_prop.empty or area_r <= 0:
-            continue
-
-        total_built = df_prop["BuiltupAreaSqFeet"].sum()
-        valid_types = ["R", "WR", "SR", "PG", "HO", "ICR"]
-
-        # Case: No split needed
-        if total_built <= area_r:
-
-            df_prop["SplitRow"] = np.where(df_prop["TypeOFUse"].isin(valid_types), "Balanced Part", "Non-Residential")
-            df_prop["Status"] = np.where(df_prop["TypeOFUse"].isin(valid_types), "Balanced", "Excess")
-
-            df_prop.loc[~df_prop["TypeOFUse"].isin(valid_types), "ConstructionYear"] = 2025
-            df_prop["PropertyCode"] = prop
-
-            all_results.append(df_prop)
+    try:
+        for idx, (index, row) in enumerate(iterator, start=checkpoint.done):
+            prop = row["PropertyCode"]
+            df_prop = df_floor[df_floor["PropertyCode"] == prop].copy()
 
-        else:
-            out = process_property(prop, area_r, df_prop)
-            if not out.empty:
+            out = split_property(prop, _area_value(row), df_prop)
+            if out is not None:
                 all_results.append(out)
-        
-        if log_callback and (idx + 1) % 100 == 0:
-             log(f"Processed {idx + 1}/{total_props} properties...")
+            checkpoint.add(out, idx + 1)
+
+            if log_callback and (idx + 1) % 100 == 0:
+                 log(f"Processed {idx + 1}/{total_props} properties...")
+    except BaseException:
+        checkpoint.flush()
+        log(f"💾 Progress checkpointed ({checkpoint.done} properties); rerun with resume to continue")
+        raise
 
     # Final combined result
     combined = pd.concat(all_results, ignore_index=True)
 
-    # Timestamped output file
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_dir = os.path.dirname(area_file)
-    output_path = os.path.join(output_dir, f"Rvadiv_{timestamp}.xlsx")
-
     log(f"\n💾 Saving output: {output_path}")
 
     try:
@@ -257,29 +491,24 @@ def main(area_file, floor_file, log_callback=None):
         wb = load_workbook(output_path)
         ws = wb["Combined"]
 
-        yellow = PatternFill(start_color="FFFF99", end_color="FFFF99", fill_type="solid")
-        red = PatternFill(start_color="FF9999", end_color="FF9999", fill_type="solid")
-
         headers = [c.value for c in ws[1]]
         split_i = headers.index("SplitRow")
         status_i = headers.index("Status")
 
         for row in ws.iter_rows(min_row=2):
-            split_val = row[split_i].value
-            status_val = row[status_i].value
-
-            if split_val in ["Balanced Part", "Overflow Split"]:
-                for c in row:
-                    c.fill = yellow
-            elif status_val == "Excess":
+            fill = _row_fill(row[split_i].value, row[status_i].value)
+            if fill:
                 for c in row:
-                    c.fill = red
+                    c.fill = fill
 
         wb.save(output_path)
     except Exception as e:
         log(f"❌ Error saving file: {e}")
+        checkpoint.flush()
+        log("💾 Results checkpointed; rerun with resume to only write the output")
         return
 
+    checkpoint.discard()
     log("\n✅ Process Completed Successfully!")
     log(f"Output File: {output_path}")
     log(f"Time Taken: {round(time.time() - start, 2)} seconds\n")
@@ -287,12 +516,188 @@ def main(area_file, floor_file, log_callback=None):
     return output_path
 
 
+def _run_streaming(df_area, df_floor, output_path, chunk_props, log, checkpoint, done_results):
+    """Split properties in chunks and stream colored rows straight to the workbook."""
+    floor_rows = df_floor.groupby("PropertyCode", sort=False).indices
+    columns = list(df_floor.columns) + ["SplitRow", "Status"]
+
+    total_props = len(df_area)
+    log(f"🏠 Processing properties in chunks of {chunk_props}...\n")
+    log(f"💾 Streaming output: {output_path}")
+
+    with write_only_sheet("Combined") as (wb, ws):
+        ws.append(columns)
+
+        # properties finished by a previous run come straight from the checkpoint
+        for out in done_results:
+            _write_streaming(ws, out, columns)
+        done_results.clear()
+
+        for chunk_start in range(checkpoint.done, total_props, chunk_props):
+            results = []
+            rows = df_area.iloc[chunk_start:chunk_start + chunk_props].iterrows()
+            for idx, (_, row) in enumerate(rows, start=chunk_start):
+                prop = row["PropertyCode"]
+                positions = floor_rows.get(prop)
+                out = None
+                if positions is not None:
+                    out = split_property(prop, _area_value(row), df_floor.iloc[positions].copy())
+                if out is not None:
+                    results.append(out)
+                checkpoint.add(out, idx + 1)
+
+            chunk_out = pd.concat(results, ignore_index=True) if results else None
+            if chunk_out is not None:
+                _write_streaming(ws, chunk_out, columns)
+
+            done = min(chunk_start + chunk_props, total_props)
+            del chunk_out
+            if done // 100 > chunk_start // 100 or done == total_props:
+                log(f"Processed {done}/{total_props} properties...")
+
+        wb.save(output_path)
+
+
+# ------------------------------------------------------------
+# PREVIEW / DRY RUN
+# ------------------------------------------------------------
+# Floor rows read per sampled property: floors of the first properties are
+# usually near the top of the floor export, but not always next to each other
+PREVIEW_FLOOR_FACTOR = 10
+# The lookup is timed again on a floor table this large (the sample repeated)
+# and on this many properties, to separate its fixed and per-floor-row cost
+PREVIEW_LOOKUP_ROWS = 100_000
+PREVIEW_LOOKUP_PROPS = 50
+
+
+def _lookup_seconds(df_floor, props):
+    """Average seconds of one `df_floor[PropertyCode == prop]` lookup, as in the full run."""
+    start = time.perf_counter()
+    for prop in props:
+        df_floor[df_floor["PropertyCode"] == prop].copy()
+    return (time.perf_counter() - start) / len(props)
+
+
+def _lookup_model(df_floor, props, total_floors):
+    """Fit seconds per lookup = fixed + per_row * floor rows from two table sizes."""
+    small = len(df_floor)
+    large = max(min(total_floors, PREVIEW_LOOKUP_ROWS), small * PREVIEW_FLOOR_FACTOR)
+    big = pd.concat([df_floor] * math.ceil(large / small), ignore_index=True).iloc[:large]
+    props = props[:PREVIEW_LOOKUP_PROPS]
+    small_s = _lookup_seconds(df_floor, props)
+    large_s = _lookup_seconds(big, props)
+    per_row = max(large_s - small_s, 0.0) / (large - small)
+    return max(small_s - per_row * small, 0.0), per_row
+
+
+def preview(area_file, floor_file, n_rows=PREVIEW_ROWS, log_callback=None, reader=None):
+    """Split the first n_rows properties only and extrapolate the full run."""
+    def log(msg):
+        if log_callback:
+            log_callback(msg)
+        else:
+            print(msg)
+
+    try:
+        backend = select_backend(reader)
+    except ValueError as e:
+        log(f"❌ {e}")
+        return
+
+    log(f"🔍 Preview (first {n_rows} properties, reader: {backend})")
+    try:
+        df_area, total_props, area_open_s, area_rows_s = sample_sheet(area_file, n_rows, backend)
+        df_floor, total_floors, floor_open_s, floor_rows_s = sample_sheet(floor_file, n_rows * PREVIEW_FLOOR_FACTOR,
+                                                                          backend)
+    except Exception as e:
+        log(f"❌ Error reading files: {e}")
+        return
+
+    if df_area.empty or df_floor.empty:
+        log("❌ No data rows found.")
+        return
+
+    df_area.columns = df_area.columns.str.strip()
+    df_floor.columns = df_floor.columns.str.strip()
+    try:
+        mapping = normalize_columns(df_area, df_floor)
+    except KeyError as e:
+        log(str(e))
+        return
+    log("✅ Columns detected: " + ", ".join(f"{src} → {dst}" for src, dst in mapping.items()))
+
+    try:
+        df_floor["FloorOrder"] = floor_order_keys(df_floor["FloorID"])
+    except ValueError as e:
+        log(f"❌ Invalid floor order table: {e}")
+        return
+
+    # Time the split on its own: the lookup scans the whole floor table for
+    # each property, so it grows with both file sizes and is modelled below
+    results = []
+    split_s = 0.0
+    matched_floors = 0
+    for _, row in df_area.iterrows():
+        prop = row["PropertyCode"]
+        df_prop = df_floor[df_floor["PropertyCode"] == prop].copy()
+        matched_floors += len(df_prop)
+        out, seconds = timed(split_property, prop, _area_value(row), df_prop)
+        split_s += seconds
+        if out is not None:
+            results.append(out)
+
+    if not results:
+        log("⚠️ None of the sampled properties produced output (no matching floors or Area_R <= 0)")
+        return
+
+    combined = pd.concat(results, ignore_index=True)
+    write_s = measure_write(combined)
+
+    # both counts are needed: the lookup cost grows with properties x floors
+    known = total_props is not None and total_floors is not None
+    process_s = read_s = output_rows = memory_bytes = None
+    if known:
+        lookup_fixed_s, lookup_row_s = _lookup_model(df_floor, list(df_area["PropertyCode"]), total_floors)
+        process_s = (split_s / len(df_area) + lookup_fixed_s + lookup_row_s * total_floors) * total_props
+        read_s = (estimate_read(area_open_s, area_rows_s, len(df_area), total_props)
+                  + estimate_read(floor_open_s, floor_rows_s, len(df_floor), total_floors))
+        if matched_floors:
+            output_rows = round(len(combined) / matched_floors * total_floors)
+        # same model as the --max-memory check of a full run
+        memory_bytes = estimate_split_bytes(
+            estimate_row_bytes(df_area) * total_props + estimate_row_bytes(df_floor) * total_floors,
+            round(len(results) / len(df_area) * total_props),
+            estimate_row_bytes(combined) * (output_rows if output_rows is not None else len(combined)))
+    estimate = extrapolate(len(df_area), total_props if known else None, read_s,
+                           process_s, write_s, combined, output_rows, memory_bytes)
+
+    log(f"🏠 {len(results)}/{len(df_area)} sampled properties have floors in the first {len(df_floor)} floor rows")
+    shown = [c for c in ["PropertyCode", "FloorID", "FloorOrder", "TypeOFUse", "BuiltupAreaSqFeet",
+                         "CarpetAreaSqFeet", "ConstructionYear", "SplitRow", "Status"] if c in combined.columns]
+    log(combined[shown].head(PREVIEW_DISPLAY_ROWS).to_string())
+    log(describe(estimate))
+
+    estimate["sample"] = combined
+    return estimate
+
+
 # ------------------------------------------------------------
 # RUN MAIN
 # ------------------------------------------------------------
 if __name__ == "__main__":
-    if len(sys.argv) < 3:
-        print("Usage: py manage.py <area_file.xlsx> <floor_file.xlsx>")
+    parser = argparse.ArgumentParser(description="Property area split & proportional carpet calculation",
+                                     usage="py manage_builtup_area.py <area_file.xlsx> <floor_file.xlsx> [--max-memory 2GB] [--reader NAME] [--resume] [--preview [N]]")
+    parser.add_argument("area_file")
+    parser.add_argument("floor_file")
+    parser.add_argument("--max-memory", help="memory budget, e.g. 2GB; large inputs are processed in chunks")
+    parser.add_argument("--reader", choices=["auto"] + BACKENDS, help="Excel reader backend (default: fastest installed)")
+    parser.add_argument("--resume", action="store_true", help="continue from the last checkpoint of an interrupted run")
+    parser.add_argument("--preview", type=int, nargs="?", const=PREVIEW_ROWS, metavar="N",
+                        help="dry run on the first N properties and estimate the full run")
+    args = parser.parse_args()
+    if args.preview is not None and args.preview < 1:
+        parser.error("--preview N must be at least 1")
+    if args.preview is not None:
+        preview(args.area_file, args.floor_file, args.preview, reader=args.reader)
     else:
-        main(sys.argv[1], sys.argv[2])
-
+        main(args.area_file, args.floor_file, max_memory=args.max_memory, reader=args.reader, resume=args.resume)
@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import pandas as pd
+
+# Seconds between checkpoints; short runs finish before the first one is written
+CHECKPOINT_INTERVAL = 60
+PART_COMPRESSION = {"method": "gzip", "compresslevel": 1}
+# Pending frames are merged once there are this many: thousands of tiny
+# per-property frames cost far more memory than one frame of the same rows
+COMPACT_FRAMES = 256
+
+
+def file_fingerprint(path):
+    """Size + SHA-256 of a file (mtime is left out so copies still match)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return {"path": os.path.abspath(path), "size": os.path.getsize(path), "sha256": digest.hexdigest()}
+
+
+def checkpoint_root():
+    """Per-user local folder for checkpoints.
+
+    Parts are pickles, so they are never kept next to the inputs: anyone who
+    can write to a shared input folder could otherwise plant one.
+    """
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") \
+        or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "RealEstateManager", "checkpoints")
+
+
+def checkpoint_dir(job, input_paths):
+    stem = os.path.splitext(os.path.basename(input_paths[0]))[0]
+    key = hashlib.sha256("\n".join(os.path.abspath(p) for p in input_paths).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(checkpoint_root(), f"{job}_{stem}_{key}")
+
+
+def _lock_file(f):
+    """Non-blocking exclusive lock; raises OSError if another process (or run) holds it."""
+    if os.name == "nt":
+        import msvcrt
+        msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    else:
+        import fcntl
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+
+class Checkpoint:
+    """Periodically saves finished result frames and how many input rows they cover.
+
+    `done` counts input rows (or properties) completed in order, so a resumed
+    run skips exactly that many. `state` holds small JSON-able extras (sets are
+    stored as lists) that must survive a restart, e.g. unmatched types.
+
+    One run owns a checkpoint folder at a time (an OS lock on <folder>.lock,
+    released when the run ends or its process dies). A concurrent run on the
+    same inputs goes ahead without checkpointing instead of mixing its parts in.
+    """
+
+    def __init__(self, directory, input_paths, interval=CHECKPOINT_INTERVAL):
+        self.directory = directory
+        self.input_paths = input_paths
+        self.interval = interval
+        self.parts = []
+        self.pending = []
+        self.done = 0
+        self.state = {}
+        self.last_flush = time.time()
+        self.enabled = True
+        self._inputs = None
+        self._lock = None
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.directory, "manifest.json")
+
+    def inputs(self):
+        # hashed lazily: runs that never checkpoint never pay for it
+        if self._inputs is None:
+            self._inputs = [file_fingerprint(p) for p in self.input_paths]
+        return self._inputs
+
+    def _acquire(self):
+        os.makedirs(os.path.dirname(self.directory), mode=0o700, exist_ok=True)
+        lock = open(self.directory + ".lock", "a")
+        try:
+            _lock_file(lock)
+        except OSError:
+            lock.close()
+            return False
+        self._lock = lock
+        return True
+
+    def close(self):
+        """Release the folder for other runs (the checkpoint itself is kept)."""
+        if self._lock is not None:
+            self._lock.close()
+            self._lock = None
+
+    def start(self, resume, log):
+        """Return the frames of a matching checkpoint when resuming, else start clean."""
+        if not self._acquire():
+            self.enabled = False
+            log("⚠️ Another run is using the checkpoint of these inputs; this run will not checkpoint or resume")
+            return []
+        if not resume:
+            self.discard()
+            return []
+        if not os.path.exists(self.manifest_path):
+            log("ℹ️ No checkpoint found, starting from the beginning")
+            return []
+
+        with open(self.manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("inputs") != self.inputs():
+            log("⚠️ Input files changed since the checkpoint, starting from the beginning")
+            self.discard()
+            return []
+
+        frames = [pd.read_pickle(os.path.join(self.directory, name), compression=PART_COMPRESSION["method"])
+                  for name in manifest["parts"]]
+        self.parts = manifest["parts"]
+        self.done = manifest["done"]
+        self.state = manifest.get("state", {})
+        log(f"♻️ Resuming from checkpoint: {self.done} already processed ({manifest['updated']})")
+        return frames
+
+    def add(self, frame, done):
+        """Record a finished result frame; flushes to disk every `interval` seconds."""
+        self.done = done
+        if not self.enabled:
+            return
+        if frame is not None and not frame.empty:
+            self.pending.append(frame)
+            if len(self.pending) >= COMPACT_FRAMES:
+                self.pending = [pd.concat(self.pending, ignore_index=True)]
+        if time.time() - self.last_flush >= self.interval:
+            self.flush()
+
+    def flush(self):
+        if not self.enabled:
+            return
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        if self.pending:
+            name = f"part_{len(self.parts):05d}.pkl.gz"
+            pd.concat(self.pending, ignore_index=True).to_pickle(os.path.join(self.directory, name),
+                                                                 compression=PART_COMPRESSION)
+            self.parts.append(name)
+            self.pending = []
+
+        manifest = {
+            "inputs": self.inputs(),
+            "done": self.done,
+            "parts": self.parts,
+            "state": self.state,
+            "updated": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        tmp = self.manifest_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2, default=sorted)
+        os.replace(tmp, self.manifest_path)
+        self.last_flush = time.time()
+
+    def discard(self):
+        if not self.enabled:
+            return
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.parts = []
+        self.pending = []
@@ -0,0 +1,57 @@
+import importlib.util
+import os
+
+import pandas as pd
+
+# ------------------------------------------------------------
+# READER BACKENDS (fastest first)
+# ------------------------------------------------------------
+# "calamine" is the Rust reader behind pandas' engine="calamine"
+# (pip install python-calamine, pandas >= 2.2). openpyxl is always there.
+BACKENDS = ["calamine", "openpyxl"]
+
+# Forced choice for every run, e.g. REM_EXCEL_READER=openpyxl
+READER_ENV = "REM_EXCEL_READER"
+
+
+def _pandas_at_least(major, minor):
+    version = tuple(int(p) for p in pd.__version__.split(".")[:2] if p.isdigit())
+    return version >= (major, minor)
+
+
+def is_available(backend):
+    if backend == "openpyxl":
+        return True
+    if backend == "calamine":
+        return importlib.util.find_spec("python_calamine") is not None and _pandas_at_least(2, 2)
+    return False
+
+
+def available_backends():
+    return [b for b in BACKENDS if is_available(b)]
+
+
+def select_backend(backend=None):
+    """Resolve "auto"/None to $REM_EXCEL_READER if set, else the fastest installed backend."""
+    backend = (backend or "auto").strip().lower()
+    if backend == "auto":
+        # the GUI always passes "auto", so the override must apply to it too
+        backend = (os.environ.get(READER_ENV) or "auto").strip().lower()
+    if backend == "auto":
+        return available_backends()[0]
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown Excel reader: {backend!r} (expected auto or one of {BACKENDS})")
+    if not is_available(backend):
+        raise ValueError(f"Excel reader {backend!r} is not installed (available: {available_backends()})")
+    return backend
+
+
+def is_forced(backend=None):
+    """True if a backend was picked by the caller or $REM_EXCEL_READER rather than left to auto."""
+    backend = (backend or "auto").strip().lower()
+    return backend != "auto" or bool((os.environ.get(READER_ENV) or "").strip())
+
+
+def read_excel(file_path, backend=None, **kwargs):
+    """pd.read_excel through the selected backend."""
+    return pd.read_excel(file_path, engine=select_backend(backend), **kwargs)
@@ -0,0 +1,134 @@
+import math
+import re
+from contextlib import contextmanager, suppress
+
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+
+
+# ------------------------------------------------------------
+# STREAMING XLSX READER (openpyxl read-only mode)
+# ------------------------------------------------------------
+ROW_TAG = re.compile(rb"<row[\s/>]")
+
+
+@contextmanager
+def first_sheet(file_path):
+    """Open the first sheet read-only. Opening loads shared strings and styles, so open once per file."""
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        yield wb.worksheets[0]
+    finally:
+        wb.close()
+
+
+def _sheet_rows(file_path):
+    with first_sheet(file_path) as ws:
+        yield from ws.iter_rows(values_only=True)
+
+
+def _columns(header):
+    """Build column names the way pd.read_excel does (Unnamed: n, name.1 ...)."""
+    columns = []
+    seen = {}
+    for i, value in enumerate(header):
+        name = f"Unnamed: {i}" if value is None else value
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        columns.append(name)
+    return columns
+
+
+def _frame(rows, columns, start):
+    df = pd.DataFrame.from_records(rows, columns=columns)
+    df.index = pd.RangeIndex(start, start + len(df))
+    return df
+
+
+def _chunks(rows, chunksize):
+    header = next(rows, None)
+    if header is None:
+        return
+    columns = _columns(header)
+    width = len(columns)
+
+    buf = []
+    start = 0
+    for row in rows:
+        if all(v is None for v in row):
+            continue
+        row = tuple(row[:width]) + (None,) * (width - len(row))
+        buf.append(row)
+        if len(buf) >= chunksize:
+            yield _frame(buf, columns, start)
+            start += len(buf)
+            buf = []
+    if buf:
+        yield _frame(buf, columns, start)
+
+
+def iter_excel_chunks(file_path, chunksize):
+    """Yield the first sheet as DataFrames of at most `chunksize` rows."""
+    yield from _chunks(_sheet_rows(file_path), chunksize)
+
+
+def sheet_head(ws, nrows):
+    """Only the first `nrows` data rows of an open sheet."""
+    return next(_chunks(ws.iter_rows(values_only=True), nrows), pd.DataFrame())
+
+
+def _count_row_tags(ws):
+    # Raw XML scan: ~100x faster than iterating the cells of a large sheet
+    count = 0
+    tail = b""
+    source = ws._get_source()
+    try:
+        for block in iter(lambda: source.read(1 << 20), b""):
+            data = tail + block
+            count += len(ROW_TAG.findall(data))
+            # too short to hold a whole tag, long enough to finish one cut by the block
+            tail = data[-4:]
+    finally:
+        source.close()
+    return count
+
+
+def sheet_data_rows(ws):
+    """Data row count of an open sheet, or None if it cannot be determined.
+
+    Uses the sheet's size record; files from write-only writers often have
+    none, then the <row> tags of the sheet XML are counted instead.
+    """
+    max_row = ws.max_row
+    if not max_row:
+        try:
+            max_row = _count_row_tags(ws)
+        except Exception:
+            # _get_source is openpyxl internals; treat a changed API as unknown
+            return None
+    return max(max_row - 1, 0)
+
+
+@contextmanager
+def write_only_sheet(title):
+    """Yield (workbook, sheet) in write-only mode; the sheet's temp stream is closed if the run fails."""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title)
+    try:
+        yield wb, ws
+    except BaseException:
+        with suppress(Exception):
+            ws.close()
+        raise
+
+
+def excel_value(value):
+    """Cell value as DataFrame.to_excel would write it (NaN -> blank, inf -> "inf")."""
+    if isinstance(value, float) and math.isinf(value):
+        return "inf" if value > 0 else "-inf"
+    if not isinstance(value, (list, tuple)) and pd.isna(value):
+        return None
+    return value
@@ -0,0 +1,87 @@
+import os
+import re
+import sys
+
+# The processing scripts live in sibling folders (same layout the GUI uses)
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for folder in ("reslivemain", "resvaduvlive"):
+    path = os.path.join(ROOT_DIR, folder)
+    if path not in sys.path:
+        sys.path.append(path)
+
+from excel_reader import BACKENDS
+from memory_budget import parse_memory
+
+
+# ------------------------------------------------------------
+# JOB DEFINITIONS
+# ------------------------------------------------------------
+# job type -> (required file parameters, optional parameters)
+JOB_TYPES = {
+    "residential": (["file_path"], ["max_memory", "reader", "resume"]),
+    "builtup": (["area_file", "floor_file"], ["max_memory", "reader", "resume"]),
+}
+
+READER_CHOICES = ["auto"] + BACKENDS
+
+PROGRESS_PATTERN = re.compile(r"Processed (\d+)/(\d+)")
+
+
+def _check_option(name, value):
+    """Type-check one optional parameter; raises ValueError on a bad value."""
+    if name == "resume" and not isinstance(value, bool):
+        raise ValueError(f"resume must be true or false, got {value!r}")
+    if name == "reader" and (not isinstance(value, str) or value.strip().lower() not in READER_CHOICES):
+        raise ValueError(f"reader must be one of {READER_CHOICES}, got {value!r}")
+    if name == "max_memory":
+        if isinstance(value, bool):
+            raise ValueError(f"Invalid memory limit: {value!r} (use e.g. 2GB or 512MB)")
+        parse_memory(value)
+    return value
+
+
+def validate_job(job_type, params):
+    """Check a job request and return the keyword arguments for run_job."""
+    if job_type not in JOB_TYPES:
+        raise ValueError(f"Unknown job type: {job_type!r} (expected one of {sorted(JOB_TYPES)})")
+    required, optional = JOB_TYPES[job_type]
+
+    kwargs = {}
+    for name in required:
+        path = params.get(name)
+        if not path:
+            raise ValueError(f"Missing parameter: {name}")
+        if not isinstance(path, str):
+            raise ValueError(f"{name} must be a file path, got {path!r}")
+        if not os.path.isfile(path):
+            raise ValueError(f"File not found: {path}")
+        kwargs[name] = os.path.abspath(path)
+    for name in optional:
+        if params.get(name) not in (None, ""):
+            kwargs[name] = _check_option(name, params[name])
+    return kwargs
+
+
+def parse_progress(message):
+    """(done, total) from a "Processed x/y ..." log line, else None."""
+    match = PROGRESS_PATTERN.search(str(message))
+    if not match:
+        return None
+    return int(match.group(1)), int(match.group(2))
+
+
+def load_modules():
+    """Import the processing scripts (pandas, openpyxl ...) so later jobs start warm."""
+    import residentialscript
+    import manage_builtup_area
+    return residentialscript, manage_builtup_area
+
+
+def run_job(job_type, kwargs, log_callback=None):
+    """Run one job and return its output path (None if the script reported an error)."""
+    residentialscript, manage_builtup_area = load_modules()
+    if job_type == "residential":
+        return residentialscript.process_residential_data(log_callback=log_callback, **kwargs)
+    if job_type == "builtup":
+        return manage_builtup_area.main(log_callback=log_callback, **kwargs)
+    raise ValueError(f"Unknown job type: {job_type!r}")
@@ -0,0 +1,228 @@
+import math
+import os
+import re
+import sys
+import threading
+from dataclasses import dataclass
+
+from excel_stream import first_sheet, sheet_head, sheet_data_rows
+
+
+# ------------------------------------------------------------
+# BUDGET PARSING
+# ------------------------------------------------------------
+_UNITS = {"": 1, "B": 1, "K": 1024, "KB": 1024, "M": 1024 ** 2, "MB": 1024 ** 2, "G": 1024 ** 3, "GB": 1024 ** 3}
+
+
+def parse_memory(value):
+    """Turn 2147483648, "2GB", "1.5 G" or "512mb" into a byte count."""
+    if isinstance(value, (int, float)):
+        size = float(value)
+    else:
+        match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([A-Za-z]*)\s*", str(value))
+        if not match or match.group(2).upper() not in _UNITS:
+            raise ValueError(f"Invalid memory limit: {value!r} (use e.g. 2GB or 512MB)")
+        size = float(match.group(1)) * _UNITS[match.group(2).upper()]
+    if not math.isfinite(size):
+        raise ValueError(f"Invalid memory limit: {value!r} (use e.g. 2GB or 512MB)")
+    if size <= 0:
+        raise ValueError(f"Memory limit must be positive: {value!r}")
+    return int(size)
+
+
+def format_bytes(size):
+    for unit in ["B", "KB", "MB", "GB"]:
+        if abs(size) < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+# ------------------------------------------------------------
+# PROCESS MEMORY (psutil if installed, else OS specific)
+# ------------------------------------------------------------
+def _windows_rss():
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    kernel32 = ctypes.windll.kernel32
+    psapi = ctypes.windll.psapi
+    kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    psapi.GetProcessMemoryInfo.argtypes = [wintypes.HANDLE, ctypes.c_void_p, wintypes.DWORD]
+
+    counters = PROCESS_MEMORY_COUNTERS()
+    counters.cb = ctypes.sizeof(counters)
+    if not psapi.GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+        return 0
+    return counters.WorkingSetSize
+
+
+def current_rss():
+    """Resident memory of this process in bytes (0 if it cannot be measured)."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        if sys.platform == "win32":
+            return _windows_rss()
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        return 0
+
+
+class MemoryMonitor:
+    """Samples process memory in a background thread and keeps the peak."""
+
+    def __init__(self, interval=0.2):
+        self.interval = interval
+        self.start_rss = current_rss()
+        self.peak = self.start_rss
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        self.peak = max(self.peak, current_rss())
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self._sample()
+        return self.peak
+
+    def report(self, budget):
+        if not self.peak:
+            return "📈 Peak memory: not measurable on this system"
+        pct = self.peak / budget * 100
+        line = f"📈 Peak memory: {format_bytes(self.peak)} of {format_bytes(budget)} budget ({pct:.0f}%)"
+        if self.peak > budget:
+            line += " ⚠️ budget exceeded"
+        return line
+
+
+# ------------------------------------------------------------
+# CHUNK PLANNING
+# ------------------------------------------------------------
+# Rough multipliers over the in-memory DataFrame size of a row:
+# a full pd.read_excel / to_excel keeps an openpyxl cell object per value,
+# which is several times larger than the resulting DataFrame.
+FULL_LOAD_OVERHEAD = 8
+STREAM_READ_OVERHEAD = 3
+STREAM_PROCESS_OVERHEAD = 3
+# Builtup split: one small result frame per property is kept until the final
+# concat, and at that size pandas' per-frame overhead dominates (~11 KB measured)
+RESULT_FRAME_BYTES = 12 * 1024
+# to_excel followed by load_workbook to colour the rows holds the output as
+# openpyxl cells about twice over (~18x its DataFrame size measured)
+OUTPUT_COLOUR_OVERHEAD = 2 * FULL_LOAD_OVERHEAD
+
+SAMPLE_ROWS = 1000
+MIN_CHUNK_ROWS = 200
+MAX_CHUNK_ROWS = 200000
+
+
+@dataclass
+class ChunkPlan:
+    budget: int
+    row_bytes: int
+    total_rows: int
+    read_rows: int
+    process_rows: int
+    estimated_bytes: int
+    fits: bool
+
+    def describe(self):
+        mode = "in-memory" if self.fits else "chunked/streaming"
+        rows = self.total_rows if self.total_rows is not None else "unknown"
+        return (f"🧮 Memory plan: ~{format_bytes(self.row_bytes)}/row, {rows} rows, "
+                f"full load ≈ {format_bytes(self.estimated_bytes)} vs budget {format_bytes(self.budget)} → {mode} "
+                f"(read {self.read_rows}, process {self.process_rows} rows per chunk)")
+
+
+def estimate_row_bytes(sample):
+    """Average in-memory bytes per row measured on a sample DataFrame."""
+    if sample is None or sample.empty:
+        return 1024
+    return int(sample.memory_usage(index=True, deep=True).sum() / len(sample)) + 1
+
+
+def _rows_for(share, row_bytes, overhead):
+    rows = int(share // (row_bytes * overhead))
+    return max(MIN_CHUNK_ROWS, min(MAX_CHUNK_ROWS, rows))
+
+
+def plan_chunks(budget, row_bytes, total_rows=None, baseline=0, resident_bytes=0):
+    """Split what is left of the budget between the read and process buffers.
+
+    Streamed output needs no share: write-only rows go straight to disk.
+
+    `baseline` is memory already in use (interpreter, libraries) and
+    `resident_bytes` anything the caller must keep loaded for the whole run.
+    """
+    available = budget - baseline - resident_bytes
+    if available < budget * 0.1:
+        available = budget * 0.1
+
+    # unknown size: assume it will not fit
+    estimated = row_bytes * total_rows * FULL_LOAD_OVERHEAD if total_rows is not None else budget + 1
+    return ChunkPlan(
+        budget=budget,
+        row_bytes=row_bytes,
+        total_rows=total_rows,
+        read_rows=_rows_for(available * 0.4, row_bytes, STREAM_READ_OVERHEAD),
+        process_rows=_rows_for(available * 0.6, row_bytes, STREAM_PROCESS_OVERHEAD),
+        estimated_bytes=estimated,
+        fits=estimated + resident_bytes <= budget - baseline,
+    )
+
+
+def estimate_split_bytes(input_bytes, result_frames, output_bytes):
+    """Peak of an in-memory builtup split: inputs, per-property result frames, write + colouring pass."""
+    return (input_bytes * FULL_LOAD_OVERHEAD + result_frames * RESULT_FRAME_BYTES
+            + output_bytes * (1 + OUTPUT_COLOUR_OVERHEAD))
+
+
+def group_chunk_size(plan, rows_per_group, group_bytes=RESULT_FRAME_BYTES):
+    """Turn plan.process_rows (rows) into groups per chunk, e.g. properties of ~3 floor rows each."""
+    share = plan.process_rows * plan.row_bytes * STREAM_PROCESS_OVERHEAD
+    per_group = rows_per_group * plan.row_bytes * STREAM_PROCESS_OVERHEAD + group_bytes
+    return max(1, int(share // per_group))
+
+
+def plan_for_file(file_path, budget, baseline=0, resident_bytes=0, sample_rows=SAMPLE_ROWS):
+    """Sample the head of a workbook and plan chunk sizes for it."""
+    with first_sheet(file_path) as ws:
+        total_rows = sheet_data_rows(ws)
+        sample = sheet_head(ws, sample_rows)
+    return plan_chunks(budget, estimate_row_bytes(sample), total_rows, baseline, resident_bytes)
@@ -0,0 +1,32 @@
+import itertools
+import os
+from datetime import datetime
+
+
+def reserve_output(output_dir, prefix, input_path, ext=".xlsx"):
+    """Create an empty <prefix>_<input stem>_<timestamp><ext> and return its path.
+
+    The file is created exclusively (a counter is appended on collision), so
+    jobs started in the same second never write to the same output.
+    """
+    stem = os.path.splitext(os.path.basename(input_path))[0]
+    base = os.path.join(output_dir, f"{prefix}_{stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    for n in itertools.count():
+        path = f"{base}_{n}{ext}" if n else f"{base}{ext}"
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            continue
+        os.close(fd)
+        return path
+
+
+def release_output(path):
+    """Remove a reserved output that was never written (the run failed)."""
+    if path and os.path.isfile(path) and os.path.getsize(path) == 0:
+        os.remove(path)
+
+
+def sidecar_path(output_path, suffix):
+    """Path of a companion file next to an output, e.g. <output>_unmatched_types.txt."""
+    return os.path.splitext(output_path)[0] + suffix
@@ -0,0 +1,116 @@
+import io
+import time
+
+import pandas as pd
+
+from excel_reader import read_excel
+from excel_stream import first_sheet, sheet_head, sheet_data_rows
+from memory_budget import FULL_LOAD_OVERHEAD, estimate_row_bytes, format_bytes
+
+PREVIEW_ROWS = 200
+PREVIEW_DISPLAY_ROWS = 15
+
+
+# ------------------------------------------------------------
+# MEASUREMENT HELPERS
+# ------------------------------------------------------------
+def timed(fn, *args, **kwargs):
+    """Call fn and return (result, seconds taken)."""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def sample_sheet(file_path, n_rows, backend="openpyxl"):
+    """(sample, total data rows or None, fixed read seconds, sample row seconds).
+
+    The sample and row count come from one read-only open. The timings are
+    for `backend`, the reader the real run will use.
+    """
+    start = time.perf_counter()
+    with first_sheet(file_path) as ws:
+        open_s = time.perf_counter() - start
+        total_rows = sheet_data_rows(ws)
+        sample, rows_s = timed(sheet_head, ws, n_rows)
+    if backend != "openpyxl":
+        # calamine parses the whole sheet before it returns nrows, so the sample
+        # read is its fixed cost; only building the frame grows with rows
+        _, open_s = timed(read_excel, file_path, backend, nrows=n_rows)
+        records = list(sample.itertuples(index=False, name=None))
+        _, rows_s = timed(pd.DataFrame.from_records, records, columns=sample.columns)
+    return sample, total_rows, open_s, rows_s
+
+
+def estimate_read(open_s, rows_s, sample_rows, total_rows):
+    """Full read time: opening (shared strings, styles) is paid once, rows scale linearly."""
+    if total_rows is None or not sample_rows:
+        return None
+    return open_s + rows_s * total_rows / sample_rows
+
+
+def measure_write(df):
+    """Seconds to write df as xlsx (in memory, nothing touches disk)."""
+    _, seconds = timed(df.to_excel, io.BytesIO(), index=False)
+    return seconds
+
+
+def format_duration(seconds):
+    if seconds < 60:
+        return f"{seconds:.0f}s"
+    if seconds < 3600:
+        return f"{seconds // 60:.0f}m {seconds % 60:.0f}s"
+    return f"{seconds // 3600:.0f}h {seconds % 3600 // 60:.0f}m"
+
+
+# ------------------------------------------------------------
+# EXTRAPOLATION
+# ------------------------------------------------------------
+ESTIMATE_KEYS = ["estimated_read_seconds", "estimated_process_seconds", "estimated_write_seconds",
+                 "estimated_seconds", "estimated_output_rows", "estimated_memory_bytes"]
+
+
+def extrapolate(sample_rows, total_rows, read_s, process_s, write_s, sample_output, output_rows=None,
+                memory_bytes=None):
+    """Combine full-run estimates; only the sample's write time is scaled here (by output rows).
+
+    `read_s` and `process_s` are already full-run figures from the caller,
+    whose costs are not linear in rows (see manage_builtup_area.preview).
+    `memory_bytes` is the caller's own peak estimate, if it has a better model
+    than output rows x FULL_LOAD_OVERHEAD.
+    Without a total row count the estimates are None rather than a guess.
+    """
+    estimate = {"sample_rows": sample_rows, "total_rows": total_rows}
+    if total_rows is None or read_s is None:
+        estimate.update(dict.fromkeys(ESTIMATE_KEYS))
+        return estimate
+
+    out_rows = output_rows if output_rows is not None else round(len(sample_output) * total_rows / sample_rows)
+    out_factor = out_rows / len(sample_output) if len(sample_output) else 0
+    if memory_bytes is None:
+        memory_bytes = estimate_row_bytes(sample_output) * out_rows * FULL_LOAD_OVERHEAD
+    estimate.update({
+        "estimated_read_seconds": read_s,
+        "estimated_process_seconds": process_s,
+        "estimated_write_seconds": write_s * out_factor,
+        "estimated_seconds": read_s + process_s + write_s * out_factor,
+        "estimated_output_rows": out_rows,
+        "estimated_memory_bytes": memory_bytes,
+    })
+    return estimate
+
+
+def describe(estimate):
+    if estimate["estimated_seconds"] is None:
+        return "\n".join([
+            f"📏 Sampled {estimate['sample_rows']} rows of an unknown total",
+            "⏱️ Runtime, output rows and memory not estimated: the row count could not be read from the file",
+        ])
+    return "\n".join([
+        f"📏 Sampled {estimate['sample_rows']} rows of {estimate['total_rows']}",
+        f"⏱️ Estimated runtime: {format_duration(estimate['estimated_seconds'])} "
+        f"(read {format_duration(estimate['estimated_read_seconds'])}, "
+        f"process {format_duration(estimate['estimated_process_seconds'])}, "
+        f"write {format_duration(estimate['estimated_write_seconds'])})",
+        f"📄 Estimated output rows: {estimate['estimated_output_rows']}",
+        f"🧠 Estimated peak memory (full load): {format_bytes(estimate['estimated_memory_bytes'])}",
+    ])
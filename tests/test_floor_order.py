@@ -0,0 +1,49 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resvaduvlive"))
+
+from manage_builtup_area import FLOOR_LEVELS, UNKNOWN_FLOOR, floor_order_keys, logical_floor_order  # noqa: E402
+
+
+# (FloorID, expected key); keys are level * 10
+FLOOR_SPELLINGS = [
+    ("G", 0), ("GF", 0), ("Ground Floor", 0), ("तळमजला", 0),
+    ("UG", 5), ("LG", -5),
+    ("1", 10), ("1st", 10), ("2ND", 20), (2, 20), (3.0, 30), ("2.0", 20), ("१", 10),
+    ("F1", 10), ("L2", 20), ("Floor 3", 30), ("FLOOR-1", 10), ("Level 2", 20), ("LVL-4", 40),
+    ("B1", -10), ("BASE", -10), ("Basement 2", -20), ("BASEMENT-1", -10), ("-1", -10),
+    ("P1", -8),
+    ("T", 1000), ("Terrace", 1000),
+    ("पहिला मजला", 10),
+    ("", UNKNOWN_FLOOR), (None, UNKNOWN_FLOOR), (np.nan, UNKNOWN_FLOOR),
+    ("xyz", UNKNOWN_FLOOR), ("inf", UNKNOWN_FLOOR),
+]
+
+
+@pytest.mark.parametrize("floor, expected", FLOOR_SPELLINGS)
+def test_logical_floor_order(floor, expected):
+    assert logical_floor_order(floor, FLOOR_LEVELS) == expected
+
+
+def test_table_override():
+    table = dict(FLOOR_LEVELS, STILT=0, PODIUM=0.5)
+    assert logical_floor_order("Stilt", table) == 0
+    assert logical_floor_order("Podium", table) == 5
+
+
+@pytest.mark.parametrize("floors, expected", [
+    (pd.Series([], dtype=object), []),
+    (pd.Series([None, np.nan, ""], dtype=object), [UNKNOWN_FLOOR] * 3),
+    (pd.Series(["1", None, "G", 2, np.nan, "B1", 1], dtype=object), [10, UNKNOWN_FLOOR, 0, 20, UNKNOWN_FLOOR, -10, 10]),
+    (pd.Series(["1", None, "G"], dtype="string"), [10, UNKNOWN_FLOOR, 0]),
+    (pd.Series(["1", "G", None, "1", "Terrace"], dtype="category"), [10, 0, UNKNOWN_FLOOR, 10, 1000]),
+])
+def test_floor_order_keys(floors, expected):
+    keys = floor_order_keys(floors, FLOOR_LEVELS)
+    assert keys.dtype == np.int64
+    assert keys.tolist() == expected
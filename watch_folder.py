@@ -0,0 +1,257 @@
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import zipfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Shared helpers (job runner) live in ./shared
+current_dir = os.path.dirname(os.path.abspath(__file__))
+shared_path = os.path.join(current_dir, 'shared')
+if shared_path not in sys.path:
+    sys.path.append(shared_path)
+
+import jobs
+
+DEFAULT_CONFIG = {
+    "folders": ["."],
+    "poll_interval": 5,
+    "settle_seconds": 10,
+    "workers": 2,
+    "ledger": "watch_ledger.json",
+    "max_memory": None,
+    "reader": None,
+    # pick up the checkpoint of a run that was cut off by a restart
+    "resume": True,
+    # First matching rule wins. Builtup rules pair an area and a floor file
+    # whose "*" parts are equal, e.g. ward7_area.xlsx + ward7_floor.xlsx.
+    "rules": [
+        {"type": "builtup", "area": "*_area.xlsx", "floor": "*_floor.xlsx"},
+        {"type": "residential", "pattern": "*.xlsx"},
+    ],
+}
+
+# Files written by the scripts themselves (and Excel lock files) are never inputs
+IGNORED_PREFIXES = ("Residential_bifurcation_", "Rvadiv_", "~$")
+
+
+def log(msg):
+    print(f"[{time.strftime('%H:%M:%S')}] {msg}", flush=True)
+
+
+def load_config(path):
+    config = dict(DEFAULT_CONFIG)
+    base_dir = current_dir
+    if path:
+        with open(path, encoding="utf-8") as f:
+            config.update(json.load(f))
+        base_dir = os.path.dirname(os.path.abspath(path))
+    # a relative ledger lives next to the config file (or this script), not the CWD
+    config["ledger"] = os.path.join(base_dir, config["ledger"])
+    return config
+
+
+# ------------------------------------------------------------
+# LEDGER (finished work survives restarts)
+# ------------------------------------------------------------
+def load_ledger(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_ledger(path, ledger):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(ledger, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def fingerprint(job_type, paths):
+    parts = [job_type]
+    for path in paths:
+        st = os.stat(path)
+        parts.append(f"{os.path.abspath(path)}:{st.st_size}:{st.st_mtime_ns}")
+    return "|".join(parts)
+
+
+# ------------------------------------------------------------
+# DEBOUNCE (skip files that are still being written)
+# ------------------------------------------------------------
+class SettleTracker:
+    def __init__(self, settle_seconds):
+        self.settle_seconds = settle_seconds
+        self.seen = {}
+
+    def is_ready(self, path, now):
+        try:
+            st = os.stat(path)
+        except OSError:
+            self.seen.pop(path, None)
+            return False
+        state = (st.st_size, st.st_mtime_ns)
+        previous = self.seen.get(path)
+        if previous is None or previous[0] != state:
+            previous = self.seen[path] = (state, now)
+        if now - previous[1] < self.settle_seconds:
+            return False
+        # a half-copied xlsx has no valid zip directory yet
+        return zipfile.is_zipfile(path)
+
+
+# ------------------------------------------------------------
+# NAMING RULES
+# ------------------------------------------------------------
+def _pattern_regex(pattern):
+    regex = "".join("(.*)" if ch == "*" else "." if ch == "?" else re.escape(ch) for ch in pattern)
+    return re.compile(regex + r"\Z", re.IGNORECASE)
+
+
+def match_jobs(folder, names, rules):
+    """Yield (job_type, kwargs, paths) for the files in one folder."""
+    claimed = set()
+    for rule in rules:
+        if rule["type"] == "builtup":
+            area_re, floor_re = _pattern_regex(rule["area"]), _pattern_regex(rule["floor"])
+            floors = {}
+            for name in names:
+                m = floor_re.match(name)
+                if m and name not in claimed:
+                    floors[m.groups()] = name
+            for name in names:
+                m = area_re.match(name)
+                if not m or name in claimed or m.groups() not in floors:
+                    continue
+                floor_name = floors[m.groups()]
+                if floor_name == name or floor_name in claimed:
+                    continue
+                claimed.update((name, floor_name))
+                paths = [os.path.join(folder, name), os.path.join(folder, floor_name)]
+                yield "builtup", {"area_file": paths[0], "floor_file": paths[1]}, paths
+            # unpaired area/floor files wait for their partner
+            claimed.update(n for n in names if area_re.match(n) or floor_re.match(n))
+        else:
+            pattern_re = _pattern_regex(rule["pattern"])
+            for name in names:
+                if name not in claimed and pattern_re.match(name):
+                    claimed.add(name)
+                    path = os.path.join(folder, name)
+                    yield rule["type"], {"file_path": path}, [path]
+
+
+def scan(config, tracker):
+    now = time.time()
+    for folder in config["folders"]:
+        try:
+            names = sorted(n for n in os.listdir(folder)
+                           if n.lower().endswith(".xlsx") and not n.startswith(IGNORED_PREFIXES))
+        except OSError as e:
+            log(f"⚠️ Cannot list {folder}: {e}")
+            continue
+        for job_type, kwargs, paths in match_jobs(folder, names, config["rules"]):
+            if all(tracker.is_ready(p, now) for p in paths):
+                for option in ("max_memory", "reader", "resume"):
+                    if config.get(option):
+                        kwargs[option] = config[option]
+                yield job_type, kwargs, paths
+
+
+# ------------------------------------------------------------
+# WORKER SIDE
+# ------------------------------------------------------------
+def _process(job_type, kwargs, label):
+    errors = []
+
+    def job_log(msg):
+        msg = str(msg)
+        if "❌" in msg:
+            errors.append(msg.strip())
+        if "Processed" not in msg:
+            print(f"[{label}] {msg.strip()}", flush=True)
+
+    output = jobs.run_job(job_type, kwargs, log_callback=job_log)
+    return output, errors[-1] if errors else None
+
+
+def watch(config, once=False):
+    ledger_path = config["ledger"]
+    ledger = load_ledger(ledger_path)
+    # --once has nothing to wait for, so files only need to be complete zips
+    tracker = SettleTracker(0 if once else config["settle_seconds"])
+    in_flight = {}
+
+    def make_pool():
+        return ProcessPoolExecutor(max_workers=config["workers"], initializer=jobs.load_modules)
+
+    log(f"👀 Watching {', '.join(config['folders'])} ({config['workers']} workers, ledger: {ledger_path})")
+    pool = make_pool()
+    try:
+        while True:
+            for job_type, kwargs, paths in scan(config, tracker):
+                try:
+                    key = fingerprint(job_type, paths)
+                except OSError:
+                    continue
+                if key in ledger or key in in_flight:
+                    continue
+                label = " + ".join(os.path.basename(p) for p in paths)
+                log(f"📥 Queued {job_type}: {label}")
+                try:
+                    future = pool.submit(_process, job_type, kwargs, label)
+                except BrokenProcessPool:
+                    # a worker died (e.g. OOM kill); its jobs fail below, new ones get a fresh pool
+                    log("⚠️ A worker process died; restarting the process pool")
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    pool = make_pool()
+                    future = pool.submit(_process, job_type, kwargs, label)
+                in_flight[key] = (future, job_type, label)
+
+            for key, (future, job_type, label) in list(in_flight.items()):
+                if not future.done():
+                    continue
+                del in_flight[key]
+                try:
+                    output, error = future.result()
+                except Exception as e:
+                    output, error = None, f"{type(e).__name__}: {e}"
+                ok = bool(output) and os.path.exists(output)
+                if ok:
+                    output = os.path.abspath(output)
+                ledger[key] = {
+                    "type": job_type,
+                    "files": label,
+                    "status": "done" if ok else "failed",
+                    "output": output if ok else None,
+                    "error": None if ok else (error or "Job produced no output"),
+                    "finished": time.strftime("%Y-%m-%d %H:%M:%S"),
+                }
+                save_ledger(ledger_path, ledger)
+                log(f"✅ Done {label} → {output}" if ok else f"❌ Failed {label}: {ledger[key]['error']}")
+
+            if once and not in_flight:
+                break
+            time.sleep(1 if once else config["poll_interval"])
+    finally:
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    parser = argparse.ArgumentParser(description="Auto-process workbooks dropped into watched folders")
+    parser.add_argument("--config", help="JSON config file (folders, rules, workers, ledger ...)")
+    parser.add_argument("--folder", action="append", help="folder to watch (overrides config, repeatable)")
+    parser.add_argument("--once", action="store_true", help="process what is there now and exit")
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    if args.folder:
+        config["folders"] = args.folder
+    try:
+        watch(config, once=args.once)
+    except KeyboardInterrupt:
+        log("Stopped.")